@@ -0,0 +1,298 @@
+# accumulators.py
+import math
+from statistics import NormalDist
+import numpy as np
+from Objects.archetypes import PLAYER_TYPES
+
+# Final happiness is an integer in 0..100, so unit-width bins keep its quantiles exact
+HAPPINESS_BINS = (0, 101, 101)
+
+
+def z_score(confidence):
+    """Two-sided normal quantile for a confidence level, e.g. 1.96 for 0.95."""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def proportion_half_width(successes, count, confidence=0.95):
+    """Agresti-Coull interval half-width for a pass rate; stays honest when every run passed or failed."""
+    if count == 0:
+        return float("inf")
+    z = z_score(confidence)
+    adjusted_count = count + z * z
+    p = (successes + z * z / 2) / adjusted_count
+    return z * math.sqrt(p * (1 - p) / adjusted_count)
+
+
+def wilson_bound(successes, count, confidence=0.95, upper=False):
+    """One-sided Wilson score bound of a proportion: p >= bound (or p <= bound) with `confidence`."""
+    if count == 0:
+        return 1.0 if upper else 0.0
+    z = NormalDist().inv_cdf(confidence)
+    p = successes / count
+    center = p + z * z / (2 * count)
+    spread = z * math.sqrt(p * (1 - p) / count + z * z / (4 * count * count))
+    bound = (center + spread if upper else center - spread) / (1 + z * z / count)
+    return min(1.0, max(0.0, bound))
+
+
+class RunningStats:
+    """Count / mean / variance accumulator (Welford), mergeable across workers (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def extend(self, values):
+        for value in values:
+            self.push(value)
+
+    @classmethod
+    def from_values(cls, values):
+        """Accumulator of a whole array in one vectorized pass."""
+        stats = cls()
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            stats.count = len(values)
+            stats.mean = float(values.mean())
+            stats.m2 = float(((values - stats.mean) ** 2).sum())
+        return stats
+
+    def merge(self, other):
+        """Folds another accumulator into this one and returns self."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence=0.95):
+        """Half-width of the normal confidence interval of the mean."""
+        if self.count < 2:
+            return float("inf")
+        return z_score(confidence) * self.stddev / math.sqrt(self.count)
+
+    def __repr__(self):
+        return f"<RunningStats count={self.count} mean={self.mean:.4f} variance={self.variance:.4f}>"
+
+
+class Histogram:
+    """Fixed-bin counts over [low, high); values outside land in the first / last bin."""
+
+    __slots__ = ("low", "high", "counts")
+
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.high = high
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def width(self):
+        return (self.high - self.low) / len(self.counts)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def push(self, value):
+        self.extend([value])
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            bins = len(self.counts)
+            index = np.clip(((values - self.low) / self.width).astype(np.int64), 0, bins - 1)
+            self.counts += np.bincount(index, minlength=bins)
+
+    def merge(self, other):
+        if (self.low, self.high, len(self.counts)) != (other.low, other.high, len(other.counts)):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q):
+        """Quantile with numpy's linear convention, each value read as its bin's lower edge."""
+        count = self.count
+        if count == 0:
+            return float("nan")
+        cumulative = np.cumsum(self.counts)
+        rank = q * (count - 1)
+        below, above = math.floor(rank), math.ceil(rank)
+        low = self.low + self.width * int(np.searchsorted(cumulative, below, side="right"))
+        high = self.low + self.width * int(np.searchsorted(cumulative, above, side="right"))
+        return low + (high - low) * (rank - below)
+
+
+class QuantileSketch:
+    """Streaming quantiles of non-negative values within a relative error (log-spaced buckets, as in DDSketch).
+
+    Memory grows with the log of the value range, not with the number of values,
+    and two sketches with the same accuracy merge by adding bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "log_gamma", "buckets", "zero_count", "count")
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def push(self, value):
+        self.extend([value])
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        self.count += len(values)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64), return_counts=True)
+        buckets = self.buckets
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * math.exp(key * self.log_gamma) / (1 + math.exp(self.log_gamma))
+        return 2 * math.exp(max(self.buckets) * self.log_gamma) / (1 + math.exp(self.log_gamma))
+
+
+class DistributionSummary:
+    """Constant-memory stand-in for a list of values: Welford stats, min / max and quantiles.
+
+    Quantiles come from a fixed-bin Histogram when bounds are given, otherwise
+    from a QuantileSketch. Summaries built the same way merge across runs and
+    workers and pickle in O(bins).
+    """
+
+    __slots__ = ("stats", "minimum", "maximum", "quantiles")
+
+    def __init__(self, low=None, high=None, bins=None, relative_accuracy=0.01):
+        self.stats = RunningStats()
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.quantiles = Histogram(low, high, bins) if bins else QuantileSketch(relative_accuracy)
+
+    @classmethod
+    def from_counts(cls, counts, low, high):
+        """Summary of values given only as fixed-bin counts, each value taken as its bin's lower edge."""
+        summary = cls(low, high, len(counts))
+        counts = np.asarray(counts, dtype=np.int64)
+        summary.quantiles.counts += counts
+        total = int(counts.sum())
+        if total:
+            values = low + summary.quantiles.width * np.arange(len(counts))
+            occupied = values[counts > 0]
+            mean = float((values * counts).sum() / total)
+            summary.stats.count = total
+            summary.stats.mean = mean
+            summary.stats.m2 = float((counts * (values - mean) ** 2).sum())
+            summary.minimum = float(occupied[0])
+            summary.maximum = float(occupied[-1])
+        return summary
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    @property
+    def mean(self):
+        return self.stats.mean if self.stats.count else float("nan")
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    def quantile(self, q):
+        return self.quantiles.quantile(q)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        self.stats.merge(RunningStats.from_values(values))
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.quantiles.extend(values)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.quantiles.merge(other.quantiles)
+        return self
+
+    def box_stats(self, label=None):
+        """Input for matplotlib's Axes.bxp, with whiskers at 1.5 IQR clipped to the data range (no fliers)."""
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        iqr = q3 - q1
+        return {
+            "label": label,
+            "mean": self.mean,
+            "med": median,
+            "q1": q1,
+            "q3": q3,
+            "whislo": max(self.minimum, q1 - 1.5 * iqr),
+            "whishi": min(self.maximum, q3 + 1.5 * iqr),
+            "fliers": [],
+        }
+
+    def __repr__(self):
+        return f"<DistributionSummary count={self.count} mean={self.mean:.4f} median={self.median:.4f}>"
+
+
+def summarize_happiness(happiness_by_type=None):
+    """Per-type DistributionSummary of a day's happiness_by_type (empty summaries when None)."""
+    summaries = {t: DistributionSummary(*HAPPINESS_BINS) for t in PLAYER_TYPES}
+    if happiness_by_type is not None:
+        for t in PLAYER_TYPES:
+            summaries[t].extend(happiness_by_type[t])
+    return summaries
+
+
+def merge_by_type(summaries, other):
+    """Folds one per-type summary dict into another and returns it."""
+    for t, summary in other.items():
+        summaries[t].merge(summary)
+    return summaries
@@ -0,0 +1,78 @@
+# adaptive.py
+import time
+from collections import namedtuple
+import numpy as np
+from Engine.accumulators import RunningStats, proportion_half_width
+from Objects.archetypes import PLAYER_TYPES
+
+# runs:       simulated days actually used
+# elapsed:    wall time in seconds
+# stopped_by: "precision", "time_budget" or "max_runs"
+# estimates:  metric name -> (mean, confidence interval half-width)
+# results:    whatever simulate_batch returned for every run, in run order
+AdaptiveResult = namedtuple("AdaptiveResult", ["runs", "elapsed", "stopped_by", "estimates", "results"])
+
+
+def day_metrics(result):
+    """Per-day values of the tracked metrics from a simulate_game_day tuple."""
+    _, avg_happy, _, tsl, _, _, dbt, _ = result
+    metrics = {
+        "pass_rate": float(avg_happy >= 75),
+        "avg_happiness": avg_happy,
+        "overload_pct": float(np.mean(np.asarray(tsl) >= 100.0)) * 100,
+    }
+    for player_type in PLAYER_TYPES:
+        metrics[f"dropouts_{player_type}"] = dbt[player_type]
+    return metrics
+
+
+def half_width(name, stats, confidence):
+    if name == "pass_rate":
+        return proportion_half_width(stats.mean * stats.count, stats.count, confidence)
+    return stats.half_width(confidence)
+
+
+def run_adaptive(simulate_batch, precision, time_budget=None, batch_size=50, max_runs=20000,
+                 confidence=0.95, metrics=day_metrics, verbose=True):
+    """Runs batches of days until every targeted metric is precise enough.
+
+    simulate_batch(start, count) must return the results of runs
+    start .. start + count - 1, and `metrics` turns one result into metric
+    values (by default day_metrics on simulate_game_day tuples). `precision`
+    maps metric names to the confidence interval half-width they need, e.g.
+    {"pass_rate": 0.02, "avg_happiness": 0.5}. Sampling also stops once
+    `time_budget` seconds have passed or `max_runs` runs are done.
+    """
+    stats = {}
+    results = []
+    start_time = time.perf_counter()
+    stopped_by = "max_runs"
+
+    while len(results) < max_runs:
+        batch = simulate_batch(len(results), min(batch_size, max_runs - len(results)))
+        for result in batch:
+            for name, value in metrics(result).items():
+                stats.setdefault(name, RunningStats()).push(value)
+        results.extend(batch)
+
+        unknown = set(precision) - set(stats)
+        if unknown:
+            raise ValueError(f"Unknown metrics in precision target: {sorted(unknown)}")
+
+        half_widths = {name: half_width(name, stats[name], confidence) for name in stats}
+        elapsed = time.perf_counter() - start_time
+        if verbose:
+            summary = ", ".join(
+                f"{name} {stats[name].mean:.3f} ± {half_widths[name]:.3f}" for name in precision
+            )
+            print(f"[Adaptive] {len(results)} runs, {elapsed:.1f}s: {summary}")
+
+        if all(half_widths[name] <= target for name, target in precision.items()):
+            stopped_by = "precision"
+            break
+        if time_budget is not None and elapsed >= time_budget:
+            stopped_by = "time_budget"
+            break
+
+    estimates = {name: (acc.mean, half_width(name, acc, confidence)) for name, acc in stats.items()}
+    return AdaptiveResult(len(results), time.perf_counter() - start_time, stopped_by, estimates, results)
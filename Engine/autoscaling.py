@@ -0,0 +1,186 @@
+# autoscaling.py
+from collections import namedtuple
+import numpy as np
+from Engine.batched_engine import HAPPINESS_DRAW, RAGE_DRAW, DaySlots, player_uniforms
+from Objects.archetypes import archetype_table
+
+# policies x days results of replay_policies
+#   names           policy names, one per row of every array
+#   avg_happiness   (policies, days) mean final happiness over every player of the day
+#   dropouts        (policies, days) rage quits
+#   server_minutes  (policies, days) sum over minutes of ceil(capacity / server_size)
+#   capacity_log    (policies, days, samples) capacity in force at every check_interval
+#   active_log      (policies, days, samples) players online at every check_interval
+PolicyTable = namedtuple("PolicyTable", [
+    "names", "avg_happiness", "dropouts", "server_minutes", "capacity_log", "active_log",
+])
+
+
+class FixedCapacity:
+    """The same capacity all day."""
+
+    def __init__(self, capacity, name=None):
+        self.capacity = capacity
+        self.name = name or f"fixed {capacity}"
+
+    def start(self, rows, samples):
+        return np.full(rows, float(self.capacity))
+
+    def update(self, sample, online, capacity):
+        return capacity
+
+
+class ThresholdScaler:
+    """Adds `step` capacity after `intervals` check intervals above `high` utilization in a row,
+    and removes it after `cooldown` intervals below `low`, within [minimum, maximum].
+
+    e.g. ThresholdScaler(150, high=0.8, intervals=2): add capacity when active_log
+    exceeds 80% for two check intervals.
+    """
+
+    def __init__(self, initial, high=0.8, low=0.4, intervals=2, cooldown=6, step=50, minimum=50, maximum=600, name=None):
+        self.initial = initial
+        self.high = high
+        self.low = low
+        self.intervals = intervals
+        self.cooldown = cooldown
+        self.step = step
+        self.minimum = minimum
+        self.maximum = maximum
+        self.name = name or f"threshold {initial} +{step} @{high:.0%}x{intervals}"
+
+    def start(self, rows, samples):
+        self.above = np.zeros(rows, dtype=np.int64)
+        self.below = np.zeros(rows, dtype=np.int64)
+        return np.full(rows, float(self.initial))
+
+    def update(self, sample, online, capacity):
+        utilization = online / capacity
+        self.above = np.where(utilization > self.high, self.above + 1, 0)
+        self.below = np.where(utilization < self.low, self.below + 1, 0)
+        up = self.above >= self.intervals
+        down = self.below >= self.cooldown
+        self.above[up] = 0
+        self.below[down] = 0
+        return np.clip(capacity + self.step * (up.astype(np.float64) - down), self.minimum, self.maximum)
+
+
+class ScheduledCapacity:
+    """Capacity by hour of the day from a 24 entry list."""
+
+    def __init__(self, hourly, name=None):
+        self.hourly = np.asarray(hourly, dtype=np.float64)
+        self.name = name or "scheduled"
+
+    def start(self, rows, samples):
+        self.samples_per_hour = max(samples // 24, 1)
+        return np.full(rows, self.hourly[0])
+
+    def update(self, sample, online, capacity):
+        return np.full(len(capacity), self.hourly[min((sample + 1) // self.samples_per_hour, 23)])
+
+
+def replay_policies(traces, policies, workday_minutes, check_interval, server_size=100):
+    """Replays every DayTrace under every policy in one lockstep pass and returns a PolicyTable.
+
+    Rows are (policy, day) pairs. The game rules are those of simulate_game_day;
+    a policy sees each row's players online and capacity at every check_interval
+    and sets the server_max_capacity of the next interval. Every row of a day
+    replays the same arrivals, sessions, spikes and per player draws, so the
+    policies differ only through their decisions.
+    """
+    table = archetype_table()
+    days, policy_count = len(traces), len(policies)
+    rows = days * policy_count
+    samples = workday_minutes // check_interval
+    row_day = np.tile(np.arange(days), policy_count)
+    policy_rows = [slice(p * days, (p + 1) * days) for p in range(policy_count)]
+
+    # Flat arrival arrays of every day; day d's arrivals of minute m start at base[d] + starts[d, m]
+    counts = np.array([trace.counts for trace in traces], dtype=np.int64)
+    types = np.concatenate([trace.types for trace in traces])
+    sessions = np.concatenate([trace.sessions for trace in traces])
+    players = np.concatenate([np.arange(len(trace.types)) for trace in traces])
+    base = np.concatenate([[0], np.cumsum(counts.sum(axis=1))[:-1]])
+    starts = np.cumsum(counts, axis=1) - counts
+    spikes = np.array([trace.spikes for trace in traces], dtype=np.float64)
+    keys = np.array([trace.key for trace in traces], dtype=np.uint64)[row_day]
+
+    capacity = np.concatenate([policy.start(days, samples) for policy in policies])
+    server_minutes = np.zeros(rows)
+    total_players_online = np.zeros(rows, dtype=np.int64)
+    happiness_sum = np.zeros(rows, dtype=np.int64)
+    dropouts = np.zeros(rows, dtype=np.int64)
+    capacity_log = np.zeros((rows, samples))
+    active_log = np.zeros((rows, samples), dtype=np.int64)
+
+    state = DaySlots(rows)
+    online = np.zeros(rows, dtype=np.int64)
+
+    def retire(mask):
+        row_index = np.nonzero(mask)[0]
+        happiness_sum[:] += np.bincount(row_index, weights=state.happiness[mask], minlength=rows).astype(np.int64)
+        dropouts[:] += np.bincount(row_index[state.rage_quit[mask]], minlength=rows)
+        state.alive &= ~mask
+
+    for minute in range(workday_minutes):
+        is_server_full = online > capacity
+        current_server_latency = np.maximum(20, 40 + online / 5) + spikes[row_day, minute]
+        server_minutes += np.ceil(capacity / server_size)
+
+        joined = counts[row_day, minute]
+        if joined.any():
+            total_players_online += joined
+            total = int(joined.sum())
+            first = np.repeat(base[row_day] + starts[row_day, minute], joined)
+            arrival = first + np.arange(total) - np.repeat(np.cumsum(joined) - joined, joined)
+            state.place(joined, types[arrival], sessions[arrival], players[arrival])
+
+        departed = state.alive & (state.session_duration <= 0)
+        if departed.any():
+            retire(departed)
+        alive = state.alive
+        online = alive.sum(axis=1)
+
+        # Tick every live player of every row, drawing from the player's own stream
+        state.session_duration -= alive
+        slot_types = state.type
+        full = is_server_full[:, None]
+        low = np.where(full, table.loss_min[slot_types], table.gain_min[slot_types])
+        high = np.where(full, table.loss_max[slot_types], table.gain_max[slot_types])
+        step = low + (player_uniforms(keys, state.player, minute, HAPPINESS_DRAW) * (high - low + 1)).astype(np.int32)
+        step = np.where(full, -step, step)
+        np.clip(state.happiness + np.where(alive, step, 0), 0, 100, out=state.happiness)
+
+        raging = is_server_full & (current_server_latency >= 100)
+        calm = alive & ~raging[:, None]
+        state.quit_rate -= np.where(calm & (state.quit_rate > 0.00), table.quit_recovery[slot_types], 0.0)
+        if raging.any():
+            rage_rows = np.flatnonzero(raging)
+            rage_alive = alive[rage_rows]
+            quit_rate = state.quit_rate[rage_rows] + np.where(rage_alive, table.quit_step[slot_types[rage_rows]], 0.0)
+            state.quit_rate[rage_rows] = quit_rate
+            uniforms = player_uniforms(keys[rage_rows], state.player[rage_rows], minute, RAGE_DRAW)
+            rage = rage_alive & (uniforms < quit_rate)
+            state.rage_quit[rage_rows] |= rage
+            state.session_duration[rage_rows] = np.where(rage, 0, state.session_duration[rage_rows])
+            state.happiness[rage_rows] = np.where(rage, 0, state.happiness[rage_rows])
+
+        if (minute + 1) % check_interval == 0:
+            sample = (minute + 1) // check_interval - 1
+            active_log[:, sample] = online
+            capacity_log[:, sample] = capacity
+            for policy, policy_slice in zip(policies, policy_rows):
+                capacity[policy_slice] = policy.update(sample, online[policy_slice], capacity[policy_slice])
+
+    retire(state.alive.copy())
+
+    shape = (policy_count, days)
+    return PolicyTable(
+        [policy.name for policy in policies],
+        (happiness_sum / np.maximum(total_players_online, 1)).reshape(shape),
+        dropouts.reshape(shape),
+        server_minutes.reshape(shape),
+        capacity_log.reshape(shape + (samples,)),
+        active_log.reshape(shape + (samples,)),
+    )
@@ -0,0 +1,225 @@
+# batched_engine.py
+from collections import namedtuple
+import numpy as np
+from Engine.arrivals import sample_arrivals
+from Engine.vectorized_engine import session_durations
+from Objects.archetypes import PLAYER_TYPES, archetype_table
+
+# Everything random about one simulated day, sampled once from the day's own stream
+#   counts    (minutes,) arrivals per minute
+#   types     type code of every arrival, in arrival order (the arrival index is the player id)
+#   sessions  session length of every arrival
+#   spikes    (minutes,) latency spike added at every minute (0 when there is none)
+#   key       seed of the per player, per minute draws (see player_uniforms)
+DayTrace = namedtuple("DayTrace", ["counts", "types", "sessions", "spikes", "key"])
+
+# Salts of the independent per player, per minute draws
+HAPPINESS_DRAW = 1
+RAGE_DRAW = 2
+
+
+def sample_trace(workday_minutes, SERVERS, rng):
+    """One day's arrival and behaviour randomness from `rng` (Engine.seeding.run_rng)."""
+    arrivals = sample_arrivals(workday_minutes, SERVERS, rng)
+    sessions = session_durations(arrivals.types, rng)
+    spike = rng.random(workday_minutes) < 0.01
+    spikes = np.where(spike, rng.integers(100, 301, size=workday_minutes), 0)
+    return DayTrace(arrivals.counts, arrivals.types, sessions, spikes, int(rng.integers(0, 2 ** 63)))
+
+
+def player_uniforms(keys, players, minute, salt):
+    """Uniforms in [0, 1) that depend only on (day key, player id, minute, salt).
+
+    A splitmix64 hash instead of a Generator, so a player draws the same
+    numbers however the days are batched and the slots of its row laid out.
+    """
+    x = (keys ^ np.uint64(salt * 0x9E3779B97F4A7C15 % 2 ** 64))[:, None] + (
+        (players.astype(np.uint64) << np.uint64(32)) + np.uint64(minute + 1)
+    ) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+class DaySlots:
+    """rows x player-slots state matrix; a slot is in use while `alive` is set.
+
+    `player` is the id (arrival index within its day) of the slot's player.
+    """
+
+    # Per-slot columns and their dtypes; subclasses may add columns
+    FIELDS = (
+        ("alive", bool),
+        ("type", np.int8),
+        ("session_duration", np.int32),
+        ("happiness", np.int32),
+        ("quit_rate", np.float64),
+        ("rage_quit", bool),
+        ("player", np.int64),
+    )
+
+    def __init__(self, days, slots=256):
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros((days, slots), dtype=dtype))
+
+    def grow(self, needed):
+        days, slots = self.alive.shape
+        slots = max(needed, 2 * slots)
+        for name, _ in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((days, slots), dtype=old.dtype)
+            new[:, :old.shape[1]] = old
+            setattr(self, name, new)
+
+    def place(self, joined, types, sessions, players):
+        """Places joined[r] new players into the first free slots of every row r, row by row."""
+        needed = int((self.alive.sum(axis=1) + joined).max())
+        if needed > self.alive.shape[1]:
+            self.grow(needed)
+        free = ~self.alive
+        new_slots = free & (np.cumsum(free, axis=1) <= joined[:, None])
+        self.type[new_slots] = types
+        self.session_duration[new_slots] = sessions
+        self.player[new_slots] = players
+        self.happiness[new_slots] = 100
+        self.quit_rate[new_slots] = 0
+        self.rage_quit[new_slots] = False
+        self.alive |= new_slots
+
+
+def simulate_game_days(capacities, workday_minutes, check_interval, SERVERS, traces=None, rng=None, happiness_counts=None):
+    """Simulates one game day per entry of `capacities`, all days advancing in lockstep.
+
+    Returns the same fields as simulate_game_day stacked over days:
+    total_players_online (D,), avg_happiness (D,), active_log (D, T),
+    total_server_latency (D, T), server_max_capacity (D,), happiness_by_type
+    (type -> final happiness of every player across all days), dropouts_by_type
+    (D, types) in PLAYER_TYPES order and disconnections (D,).
+
+    `traces` holds one DayTrace per day, sampled from `rng` when missing. Every
+    draw of a day comes from its trace, per player through player_uniforms, so
+    a day traced from run_rng(seed, run_index) gives the same numbers in any
+    batch, of any size.
+
+    `happiness_counts`, an optional (D, types, 101) integer array, receives
+    each day's final happiness histogram per type (bin h counts happiness h).
+    """
+    table = archetype_table()
+    capacities = np.asarray(capacities, dtype=np.float64)
+    days = len(capacities)
+    samples = workday_minutes // check_interval
+    type_count = len(PLAYER_TYPES)
+
+    # When every archetype gains and loses happiness over the same range, skip the per-slot lookups
+    step_ranges = set(zip(table.gain_min, table.gain_max)) | set(zip(table.loss_min, table.loss_max))
+    shared_step = step_ranges.pop() if len(step_ranges) == 1 else None
+
+    if traces is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        traces = [sample_trace(workday_minutes, SERVERS, rng) for _ in range(days)]
+
+    # Flat arrival arrays of every day; day d's arrivals of minute m start at base[d] + starts[d, m]
+    counts = np.array([trace.counts for trace in traces], dtype=np.int64)
+    types = np.concatenate([trace.types for trace in traces])
+    sessions = np.concatenate([trace.sessions for trace in traces])
+    players = np.concatenate([np.arange(len(trace.types)) for trace in traces])
+    base = np.concatenate([[0], np.cumsum(counts.sum(axis=1))[:-1]])
+    starts = np.cumsum(counts, axis=1) - counts
+    spikes = np.array([trace.spikes for trace in traces], dtype=np.float64)
+    keys = np.array([trace.key for trace in traces], dtype=np.uint64)
+
+    total_players_online = np.zeros(days, dtype=np.int64)
+    happiness_sum = np.zeros(days, dtype=np.int64)
+    dropouts_by_type = np.zeros((days, type_count), dtype=np.int64)
+    active_log = np.zeros((days, samples), dtype=np.int64)
+    total_server_latency = np.zeros((days, samples), dtype=np.float64)
+
+    retired_types = []
+    retired_happiness = []
+
+    state = DaySlots(days)
+    online = np.zeros(days, dtype=np.int64)
+
+    def retire(mask):
+        happiness = state.happiness[mask]
+        types = state.type[mask]
+        day_index = np.nonzero(mask)[0]
+        retired_types.append(types)
+        retired_happiness.append(happiness)
+        if happiness_counts is not None:
+            bins = happiness_counts.shape[2]
+            happiness_counts.reshape(-1)[:] += np.bincount(
+                (day_index * type_count + types) * bins + happiness, minlength=happiness_counts.size
+            ).astype(happiness_counts.dtype)
+        happiness_sum[:] += np.bincount(day_index, weights=happiness, minlength=days).astype(np.int64)
+        rage = state.rage_quit[mask]
+        dropouts_by_type.reshape(-1)[:] += np.bincount(
+            day_index[rage] * type_count + types[rage], minlength=days * type_count
+        )
+        state.alive &= ~mask
+
+    for minute in range(workday_minutes):
+        is_server_full = online > capacities
+        current_server_latency = np.maximum(20, 40 + online / 5) + spikes[:, minute]
+
+        joined = counts[:, minute]
+        if joined.any():
+            total_players_online += joined
+            total = int(joined.sum())
+            first = np.repeat(base + starts[:, minute], joined)
+            arrival = first + np.arange(total) - np.repeat(np.cumsum(joined) - joined, joined)
+            state.place(joined, types[arrival], sessions[arrival], players[arrival])
+
+        departed = state.alive & (state.session_duration <= 0)
+        if departed.any():
+            retire(departed)
+        alive = state.alive
+        online = alive.sum(axis=1)
+
+        # Tick every live player of every day at once, drawing from the player's own stream
+        state.session_duration -= alive
+        slot_types = state.type
+        full = is_server_full[:, None]
+        uniforms = player_uniforms(keys, state.player, minute, HAPPINESS_DRAW)
+        if shared_step is not None:
+            step = shared_step[0] + (uniforms * (shared_step[1] - shared_step[0] + 1)).astype(np.int32)
+        else:
+            low = np.where(full, table.loss_min[slot_types], table.gain_min[slot_types])
+            high = np.where(full, table.loss_max[slot_types], table.gain_max[slot_types])
+            step = low + (uniforms * (high - low + 1)).astype(np.int32)
+        step = np.where(full, -step, step)
+        np.clip(state.happiness + np.where(alive, step, 0), 0, 100, out=state.happiness)
+
+        raging = is_server_full & (current_server_latency >= 100)
+        calm = alive & ~raging[:, None]
+        state.quit_rate -= np.where(calm & (state.quit_rate > 0.00), table.quit_recovery[slot_types], 0.0)
+        if raging.any():
+            rage_rows = np.flatnonzero(raging)
+            rage_alive = alive[rage_rows]
+            quit_rate = state.quit_rate[rage_rows] + np.where(rage_alive, table.quit_step[slot_types[rage_rows]], 0.0)
+            state.quit_rate[rage_rows] = quit_rate
+            uniforms = player_uniforms(keys[rage_rows], state.player[rage_rows], minute, RAGE_DRAW)
+            rage = rage_alive & (uniforms < quit_rate)
+            state.rage_quit[rage_rows] |= rage
+            state.session_duration[rage_rows] = np.where(rage, 0, state.session_duration[rage_rows])
+            state.happiness[rage_rows] = np.where(rage, 0, state.happiness[rage_rows])
+
+        if (minute + 1) % check_interval == 0:
+            sample = (minute + 1) // check_interval - 1
+            active_log[:, sample] = online
+            total_server_latency[:, sample] = current_server_latency
+
+    retire(state.alive.copy())
+
+    types = np.concatenate(retired_types)
+    happiness = np.concatenate(retired_happiness)
+    happiness_by_type = {name: happiness[types == code] for code, name in enumerate(PLAYER_TYPES)}
+
+    avg_happiness = happiness_sum / total_players_online
+    disconnections = dropouts_by_type.sum(axis=1)
+
+    return total_players_online, avg_happiness, active_log, total_server_latency, capacities, happiness_by_type, dropouts_by_type, disconnections
@@ -0,0 +1,96 @@
+# capacity_search.py
+from collections import namedtuple
+from Engine.accumulators import wilson_bound
+
+# capacity:   server_max_capacity tried
+# days:       simulated days behind the decision
+# successes:  days that met the criterion
+# meets:      success rate judged >= target
+# decided:    True when the confidence bounds settled it, False when the day cap forced a point-estimate call
+Probe = namedtuple("Probe", ["capacity", "days", "successes", "meets", "decided"])
+
+# capacity:     smallest capacity found to meet the target
+# verified:     its lower confidence bound reached the target
+# lower_bound:  one-sided lower bound of its success rate at the search confidence
+# days:         simulated days across every capacity tried
+# probes:       every decision of the search, in order (the last ones are the verification)
+CapacitySearch = namedtuple("CapacitySearch", ["capacity", "verified", "success_rate", "lower_bound", "days", "probes"])
+
+
+class OutcomeCache:
+    """Per-capacity day outcomes, so a capacity probed twice only simulates the days it has not seen."""
+
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+        self.outcomes = {}
+
+    def successes(self, capacity, days):
+        seen = self.outcomes.setdefault(capacity, [])
+        if len(seen) < days:
+            seen.extend(bool(ok) for ok in self.evaluate(capacity, len(seen), days - len(seen)))
+        return sum(seen[:days])
+
+    @property
+    def days(self):
+        return sum(len(seen) for seen in self.outcomes.values())
+
+
+def sequential_test(cache, capacity, target, confidence, batch_size, max_days):
+    """Adds batches of days at `capacity` until the one-sided Wilson bounds put its success rate on one side of `target`."""
+    days = 0
+    while days < max_days:
+        days = min(days + batch_size, max_days)
+        successes = cache.successes(capacity, days)
+        if wilson_bound(successes, days, confidence) >= target:
+            return Probe(capacity, days, successes, True, True)
+        if wilson_bound(successes, days, confidence, upper=True) < target:
+            return Probe(capacity, days, successes, False, True)
+    return Probe(capacity, days, successes, successes / days >= target, False)
+
+
+def search_capacity(evaluate, low, high, target=0.9, confidence=0.95, resolution=1,
+                    batch_size=20, probe_days=100, verify_days=1000):
+    """Smallest capacity in [low, high] whose per-day success probability is at least `target`.
+
+    evaluate(capacity, start, count) returns whether each of days start ..
+    start + count - 1 met the criterion at that capacity. Day i must draw the
+    same random numbers at every capacity (common random numbers): neighbouring
+    probes then differ only through the capacity, so the bisection rarely
+    contradicts itself on noise.
+
+    The search bisects [low, high] down to `resolution`, spending at most
+    `probe_days` per probe, assuming the success rate grows with capacity.
+    Clear-cut probes settle after a batch or two; only the final candidate is
+    verified at the stated `confidence` (up to `verify_days`), and the
+    candidate moves up by `resolution` while verification fails. Bounds are
+    re-checked after every batch, which makes the stated confidence slightly
+    optimistic.
+    """
+    cache = OutcomeCache(evaluate)
+    probes = []
+    maximum = high
+    while high - low > resolution:
+        middle = (low + high) // 2
+        probe = sequential_test(cache, middle, target, confidence, batch_size, probe_days)
+        probes.append(probe)
+        if probe.meets:
+            high = middle
+        else:
+            low = middle + 1
+
+    capacity = high
+    while True:
+        probe = sequential_test(cache, capacity, target, confidence, batch_size, verify_days)
+        probes.append(probe)
+        verified = probe.meets and probe.decided
+        if verified or capacity >= maximum:
+            break
+        capacity = min(maximum, capacity + resolution)
+    return CapacitySearch(
+        capacity,
+        verified,
+        probe.successes / probe.days,
+        wilson_bound(probe.successes, probe.days, confidence),
+        cache.days,
+        probes,
+    )
@@ -0,0 +1,257 @@
+# cluster_engine.py
+import heapq
+from collections import namedtuple
+import numpy as np
+from Engine.arrivals import sample_arrivals
+from Engine.vectorized_engine import PlayerArrays, random_steps
+from Objects.archetypes import PLAYER_TYPES, archetype_table
+
+# One simulated day of a whole cluster
+#   total_players_online  players who joined any server
+#   avg_happiness         mean final happiness over every player of the cluster
+#   active_log            (servers, samples) players online per server at every check_interval
+#   server_latency        (servers, samples) latency per server at every check_interval
+#   capacities            (servers,) server_max_capacity of every server
+#   happiness_by_type     type -> final happiness of every player
+#   dropouts_by_type      type -> rage quits
+#   disconnections        rage quits over the cluster
+#   migrations            players moved off a full server
+ClusterDay = namedtuple("ClusterDay", [
+    "total_players_online", "avg_happiness", "active_log", "server_latency", "capacities",
+    "happiness_by_type", "dropouts_by_type", "disconnections", "migrations",
+])
+
+
+class ClusterPlayers(PlayerArrays):
+    """PlayerArrays of every player in the cluster, with the server each one is on."""
+
+    FIELDS = PlayerArrays.FIELDS + (("server", np.int32),)
+
+    def spawn(self, types, servers, rng):
+        start = self.size
+        super().spawn(types, rng)
+        self.server[start:self.size] = servers
+
+
+# Routing policies: route(online, capacities, count, rng) -> server of each of `count`
+# arrivals of one minute, given the players online per server when they arrive.
+
+class RandomRouter:
+    """Every arrival goes to a uniformly random server."""
+
+    def __init__(self, servers):
+        self.servers = servers
+
+    def route(self, online, capacities, count, rng):
+        return rng.integers(0, self.servers, size=count)
+
+
+class RoundRobinRouter:
+    """Arrivals cycle through the servers, whatever their load."""
+
+    def __init__(self, servers):
+        self.servers = servers
+        self.cursor = 0
+
+    def route(self, online, capacities, count, rng):
+        servers = (self.cursor + np.arange(count)) % self.servers
+        self.cursor = (self.cursor + count) % self.servers
+        return servers
+
+
+class LeastLoadedRouter:
+    """Every arrival goes to the server with the lowest online / capacity, counting earlier arrivals of the minute.
+
+    One heap per minute: O(servers + arrivals log servers).
+    """
+
+    def __init__(self, servers):
+        self.servers = servers
+
+    def route(self, online, capacities, count, rng):
+        load = online.tolist()
+        capacity = capacities.tolist()
+        heap = [(load[s] / capacity[s], s) for s in range(self.servers)]
+        heapq.heapify(heap)
+        servers = np.empty(count, dtype=np.int64)
+        for arrival in range(count):
+            server = heap[0][1]
+            servers[arrival] = server
+            load[server] += 1
+            heapq.heapreplace(heap, (load[server] / capacity[server], server))
+        return servers
+
+
+class PowerOfTwoRouter:
+    """Every arrival samples two servers and joins the one with the lower online / capacity."""
+
+    def __init__(self, servers):
+        self.servers = servers
+
+    def route(self, online, capacities, count, rng):
+        load = online.tolist()
+        capacity = capacities.tolist()
+        servers = np.empty(count, dtype=np.int64)
+        for arrival, (first, second) in enumerate(rng.integers(0, self.servers, size=(count, 2)).tolist()):
+            server = first if load[first] / capacity[first] <= load[second] / capacity[second] else second
+            servers[arrival] = server
+            load[server] += 1
+        return servers
+
+
+ROUTERS = {
+    "random": RandomRouter,
+    "round-robin": RoundRobinRouter,
+    "least-loaded": LeastLoadedRouter,
+    "power-of-two": PowerOfTwoRouter,
+}
+
+
+def migrate(players, capacities):
+    """Moves the newest players beyond the capacity of every full server to the servers with the most room.
+
+    Destinations are filled least-loaded first (by online / capacity after the
+    move); players who find no room stay where they are. Returns how many moved.
+    """
+    n = players.size
+    server = players.server[:n]
+    online = np.bincount(server, minlength=len(capacities))
+    limit = np.floor(capacities).astype(np.int64)
+    room = np.maximum(limit - online, 0)
+    if not (online > limit).any() or not room.any():
+        return 0
+
+    # Rank of every player within its server; the arrays keep join order
+    order = np.argsort(server, kind="stable")
+    starts = np.cumsum(online) - online
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - starts[server[order]]
+    movers = np.flatnonzero(rank >= limit[server])
+
+    # Free slot j of server s leaves it at (online + j + 1) / capacity; take the lowest
+    slot_server = np.repeat(np.arange(len(capacities)), room)
+    slot_index = np.arange(len(slot_server)) - np.repeat(np.cumsum(room) - room, room)
+    fill = (online[slot_server] + slot_index + 1) / capacities[slot_server]
+    moved = min(len(movers), len(slot_server))
+    if moved < len(slot_server):
+        slot_server = slot_server[np.argpartition(fill, moved - 1)[:moved]]
+    players.server[movers[:moved]] = slot_server
+    return moved
+
+
+def tick_cluster(players, is_server_full, current_server_latency, rng):
+    """tick_players with every player reading the full flag and latency of its own server."""
+    table = archetype_table()
+    n = players.size
+    types = players.type[:n]
+    server = players.server[:n]
+    session = players.session_duration[:n]
+    happiness = players.happiness[:n]
+    quit_rate = players.quit_rate[:n]
+    full = is_server_full[server]
+
+    session[session > 0] -= 1
+
+    # Controls player happiness score according to server capacity
+    low = np.where(full, table.loss_min[types], table.gain_min[types])
+    high = np.where(full, table.loss_max[types], table.gain_max[types])
+    step = random_steps(low, high, rng)
+    step = np.where(full, -np.where(happiness > 0, step, 0), np.where(happiness < 100, step, 0))
+    np.clip(happiness + step, 0, 100, out=happiness)
+
+    # Controls player rage quits according to server latency
+    raging = full & (current_server_latency[server] >= 100)
+    if raging.any():
+        index = np.flatnonzero(raging)
+        quit_rate[index] += table.quit_step[types[index]]
+        rage = index[rng.random(len(index)) < quit_rate[index]]
+        players.rage_quit[rage] = True
+        session[rage] = 0
+        happiness[rage] = 0
+    recovering = ~raging & (quit_rate > 0.00)
+    quit_rate[recovering] -= table.quit_recovery[types[recovering]]
+
+
+def simulate_cluster_day(workday_minutes, check_interval, capacities, policy="least-loaded", migrate_full=False,
+                         arrival_scale=None, arrivals=None, rng=None):
+    """Simulates one day of a cluster of len(capacities) servers behind a load balancer.
+
+    Unlike SERVERS, which thins arrivals to model one shard of an evenly split
+    cluster, every server here has its own players, latency and full flag, and
+    arrivals are routed by the ROUTERS `policy`. With `migrate_full`, the newest
+    players beyond a full server's capacity move to servers with room at the
+    start of every minute.
+
+    The cluster's spawn curve is `arrival_scale` (default: the server count)
+    times the single-server one, so per-server capacities compare with
+    ordinary sweeps. Player state lives in flat arrays tagged with a server
+    index; a minute costs O(players + servers), not O(players x servers).
+    Returns a ClusterDay.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    capacities = np.asarray(capacities, dtype=np.float64)
+    servers = len(capacities)
+    if policy not in ROUTERS:
+        raise ValueError(f"Unknown routing policy: {policy}")
+    router = ROUTERS[policy](servers)
+    if arrivals is None:
+        scale = servers if arrival_scale is None else arrival_scale
+        arrivals = sample_arrivals(workday_minutes, 1, rng, base_rate=5 * scale, peak_rate=15 * scale)
+    arrival = 0
+    total_players_online = 0
+    migrations = 0
+
+    retired_types = []
+    retired_happiness = []
+    dropouts = np.zeros(len(PLAYER_TYPES), dtype=np.int64)
+
+    players = ClusterPlayers()
+    samples = workday_minutes // check_interval
+    active_log = np.zeros((servers, samples), dtype=np.int64)
+    server_latency = np.zeros((servers, samples), dtype=np.float64)
+
+    def retire(mask):
+        types = players.type[:players.size][mask]
+        retired_types.append(types)
+        retired_happiness.append(players.happiness[:players.size][mask])
+        rage_types = types[players.rage_quit[:players.size][mask]]
+        dropouts[:] += np.bincount(rage_types, minlength=len(PLAYER_TYPES))
+
+    for minute in range(workday_minutes):
+        if migrate_full:
+            migrations += migrate(players, capacities)
+        online = np.bincount(players.server[:players.size], minlength=servers)
+        is_server_full = online > capacities
+
+        current_server_latency = np.maximum(20, 40 + online / 5)
+        spike = rng.random(servers) < 0.01
+        current_server_latency[spike] += rng.integers(100, 301, size=int(spike.sum()))
+
+        joined = int(arrivals.counts[minute])
+        if joined:
+            total_players_online += joined
+            players.spawn(arrivals.types[arrival:arrival + joined], router.route(online, capacities, joined, rng), rng)
+            arrival += joined
+
+        active = players.session_duration[:players.size] > 0
+        if not active.all():
+            retire(~active)
+            players.compact(active)
+        tick_cluster(players, is_server_full, current_server_latency, rng)
+
+        if (minute + 1) % check_interval == 0:
+            sample = (minute + 1) // check_interval - 1
+            active_log[:, sample] = np.bincount(players.server[:players.size], minlength=servers)
+            server_latency[:, sample] = current_server_latency
+
+    retire(np.ones(players.size, dtype=bool))
+
+    types = np.concatenate(retired_types)
+    happiness = np.concatenate(retired_happiness)
+    happiness_by_type = {name: happiness[types == code] for code, name in enumerate(PLAYER_TYPES)}
+    dropouts_by_type = {name: int(dropouts[code]) for code, name in enumerate(PLAYER_TYPES)}
+    avg_happiness = float(happiness.sum()) / total_players_online
+
+    return ClusterDay(total_players_online, avg_happiness, active_log, server_latency, capacities,
+                      happiness_by_type, dropouts_by_type, int(dropouts.sum()), migrations)
@@ -0,0 +1,177 @@
+# day_cache.py
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+from Engine.seeding import run_rng
+from Objects.archetypes import ARCHETYPES
+
+# Where and how much to cache
+#   directory     on-disk tier shared by every process (None: memory only)
+#   memory_items  simulated days kept in each process' LRU tier
+#   disk_bytes    byte budget of the on-disk tier; least recently used files go first
+CacheConfig = namedtuple("CacheConfig", ["directory", "memory_items", "disk_bytes"], defaults=[None, 256, 1 << 30])
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_fingerprints = {}
+
+
+def code_fingerprint(function):
+    """sha256 of the source of `function`'s module and of every repo module it reaches through its globals.
+
+    Changing an engine, Player, PlayerPool, the archetypes or the arrival
+    sampling changes the fingerprint, and with it every cache key.
+    """
+    if function in _fingerprints:
+        return _fingerprints[function]
+    seen = set()
+    stack = [sys.modules[function.__module__]]
+    while stack:
+        module = stack.pop()
+        path = getattr(module, "__file__", None)
+        if path is None or path in seen or not os.path.abspath(path).startswith(_ROOT):
+            continue
+        seen.add(path)
+        for value in vars(module).values():
+            if inspect.ismodule(value):
+                stack.append(value)
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                stack.append(sys.modules.get(value.__module__))
+    digest = hashlib.sha256()
+    for path in sorted(seen):
+        digest.update(os.path.relpath(path, _ROOT).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    _fingerprints[function] = digest.hexdigest()
+    return _fingerprints[function]
+
+
+def day_key(simulate, workday_minutes, check_interval, capacity, servers, seed, stream):
+    """Content address of one simulated day: engine, its code, every argument, the RNG stream and the archetypes."""
+    payload = json.dumps({
+        "engine": f"{simulate.__module__}.{simulate.__name__}",
+        "code": code_fingerprint(simulate),
+        "seeding": code_fingerprint(run_rng),
+        "numpy": np.__version__,
+        "archetypes": [list(archetype) for archetype in ARCHETYPES],
+        "args": [int(workday_minutes), int(check_interval), float(capacity), int(servers)],
+        "seed": int(seed),
+        "stream": int(stream),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DayCache:
+    """Two-tier memo of simulated day results: an in-process LRU and a directory of pickles.
+
+    Disk hits are promoted to memory and have their file's mtime refreshed,
+    which is the recency the disk tier evicts by once it outgrows its budget.
+    The threads of a ThreadBackend share one DayCache: `lock` guards the LRU,
+    the counters and the disk byte count, never the file I/O.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.memory = OrderedDict()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.disk_bytes = None  # measured on first write
+        self.lock = threading.Lock()
+        if config.directory is not None:
+            os.makedirs(config.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.config.directory, f"{key}.pkl")
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return self.memory[key]
+        if self.config.directory is not None:
+            try:
+                with open(self.path(key), "rb") as f:
+                    result = pickle.load(f)
+                os.utime(self.path(key))
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                pass  # missing, or evicted / half-written by another process
+            else:
+                with self.lock:
+                    self.hits["disk"] += 1
+                    self.remember(key, result)
+                return result
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, result):
+        with self.lock:
+            self.remember(key, result)
+        if self.config.directory is None:
+            return
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        temporary = f"{self.path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, self.path(key))
+        with self.lock:
+            if self.disk_bytes is None:
+                self.disk_bytes = disk_usage(self.config.directory)[0]
+            else:
+                self.disk_bytes += len(data)
+            if self.disk_bytes > self.config.disk_bytes:
+                self.disk_bytes = evict(self.config.directory, self.config.disk_bytes)
+
+    def remember(self, key, result):
+        """Adds `result` to the memory tier; the caller holds `lock`."""
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.config.memory_items:
+            self.memory.popitem(last=False)
+
+
+def disk_usage(directory):
+    """(bytes, files) of the cached days in `directory`."""
+    sizes = [entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".pkl")]
+    return sum(sizes), len(sizes)
+
+
+def evict(directory, budget, headroom=0.9):
+    """Deletes least recently used files until the tier holds at most headroom x budget; returns its size."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".pkl"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= headroom * budget:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def day_cache(config):
+    """This process' DayCache for `config`, created on first use."""
+    key = (config, os.getpid())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = DayCache(config)
+        return _caches[key]
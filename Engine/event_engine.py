@@ -0,0 +1,170 @@
+# event_engine.py
+import heapq
+import math
+import numpy as np
+from Engine.arrivals import sample_arrivals
+from Objects.archetypes import ARCHETYPES, PLAYER_TYPES
+
+# Event kinds, in the order they are handled within one minute
+SPAWN = 0         # a batch of players joins
+SESSION_END = 1   # a player retires (session over or rage quit)
+LATENCY_SPIKE = 2 # +100..300ms latency this minute
+SERVER_FULL = 3   # capacity threshold crossed, the minute has to be ticked explicitly
+SAMPLE = 4        # check_interval log point
+
+
+def simulate_game_day_events(workday_minutes, check_interval, server_max_capacity, SERVERS, arrivals=None, rng=None):
+    """Discrete-event version of simulate_game_day (same return tuple).
+
+    Minutes where nothing is scheduled and the server is not full are skipped.
+    While the server is not full a player's happiness and quit_rate evolve
+    independently of everything else, so each player is only brought up to
+    date in closed form when it retires or when the server fills up; per-minute
+    ticks happen only on minutes where the server is full.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if arrivals is None:
+        arrivals = sample_arrivals(workday_minutes, SERVERS, rng)
+    arrival_types = arrivals.types.tolist()
+    arrival = 0
+
+    total_players_online = 0
+    disconnections = 0
+
+    # Per-type metrics, indexed by type code
+    happiness_by_code = [[] for _ in PLAYER_TYPES]
+    dropouts_by_code = [0] * len(PLAYER_TYPES)
+    total_happiness = []
+    active_log = []
+    total_server_latency = []
+
+    # Player state, indexed by player id (players are never reused within a day)
+    player_type = []
+    tick_end = []    # first minute the player no longer ticks (= the minute it retires)
+    synced = []      # happiness / quit_rate are current up to (excluding) this minute
+    happiness = []
+    quit_rate = []
+    rage_quit = []
+    online = set()
+
+    events = []
+    for minute in np.flatnonzero(arrivals.counts).tolist():
+        events.append((minute, SPAWN, int(arrivals.counts[minute])))
+    for minute in range(workday_minutes):
+        if rng.random() < 0.01:
+            events.append((minute, LATENCY_SPIKE, int(rng.integers(100, 301))))
+        if (minute + 1) % check_interval == 0:
+            events.append((minute, SAMPLE, 0))
+    heapq.heapify(events)
+
+    def advance(pid, minute):
+        """Applies the not-full ticks in [synced, minute) in closed form."""
+        ticks = min(minute, tick_end[pid]) - synced[pid]
+        if ticks > 0:
+            archetype = ARCHETYPES[player_type[pid]]
+            if happiness[pid] < 100:
+                # Sum of `ticks` uniform gains; the clamp at 100 is absorbing
+                low, high = archetype.happiness_gain
+                if high - low == 1:
+                    gain = ticks * low + int(rng.binomial(ticks, 0.5))
+                else:
+                    gain = int(rng.integers(low, high + 1, size=ticks).sum())
+                happiness[pid] = min(100, happiness[pid] + gain)
+            if quit_rate[pid] > 0.00:
+                recovery = archetype.quit_recovery
+                if recovery > 0:
+                    quit_rate[pid] -= recovery * min(ticks, math.ceil(quit_rate[pid] / recovery))
+                else:
+                    # Never reaches 0, so every tick applies (none of them changes it when recovery is 0)
+                    quit_rate[pid] -= recovery * ticks
+        synced[pid] = max(synced[pid], minute)
+
+    def retire(pid):
+        code = player_type[pid]
+        total_happiness.append(happiness[pid])
+        happiness_by_code[code].append(happiness[pid])
+        if rage_quit[pid]:
+            dropouts_by_code[code] += 1
+            return 1
+        return 0
+
+    while events and events[0][0] < workday_minutes:
+        minute = events[0][0]
+        spawns = 0
+        spike = 0
+        ending = []
+        sample = False
+        while events and events[0][0] == minute:
+            _, kind, payload = heapq.heappop(events)
+            if kind == SPAWN:
+                spawns += payload
+            elif kind == SESSION_END:
+                if tick_end[payload] == minute:  # stale if the player rage quit earlier
+                    ending.append(payload)
+            elif kind == LATENCY_SPIKE:
+                spike = payload
+            elif kind == SAMPLE:
+                sample = True
+
+        is_server_full = len(online) > server_max_capacity
+        current_server_latency = max(20, 40 + (len(online) / 5)) + spike
+
+        for code in arrival_types[arrival:arrival + spawns]:
+            pid = len(player_type)
+            archetype = ARCHETYPES[code]
+            end = minute + max(1, int(rng.normal(archetype.session_mean, archetype.session_stddev)))
+            player_type.append(code)
+            tick_end.append(end)
+            synced.append(minute)
+            happiness.append(100)
+            quit_rate.append(0)
+            rage_quit.append(False)
+            online.add(pid)
+            heapq.heappush(events, (end, SESSION_END, pid))
+        total_players_online += spawns
+        arrival += spawns
+
+        for pid in ending:
+            advance(pid, minute)
+            disconnections += retire(pid)
+            online.discard(pid)
+
+        if is_server_full:
+            raging = current_server_latency >= 100
+            for pid in online:
+                if synced[pid] < minute:
+                    advance(pid, minute)
+                archetype = ARCHETYPES[player_type[pid]]
+                if happiness[pid] > 0:
+                    low, high = archetype.happiness_loss
+                    happiness[pid] = max(0, happiness[pid] - low - int(rng.random() * (high - low + 1)))
+                if raging:
+                    quit_rate[pid] += archetype.quit_step
+                    if rng.random() < quit_rate[pid]:
+                        rage_quit[pid] = True
+                        happiness[pid] = 0
+                        if tick_end[pid] != minute + 1:
+                            tick_end[pid] = minute + 1
+                            heapq.heappush(events, (minute + 1, SESSION_END, pid))
+                elif quit_rate[pid] > 0.00:
+                    quit_rate[pid] -= archetype.quit_recovery
+                synced[pid] = minute + 1
+
+        if sample:
+            active_log.append(len(online))
+            total_server_latency.append(current_server_latency)
+
+        if len(online) > server_max_capacity:
+            heapq.heappush(events, (minute + 1, SERVER_FULL, 0))
+
+    for pid in online:
+        advance(pid, workday_minutes)
+        disconnections += retire(pid)
+
+    happiness_by_type = dict(zip(PLAYER_TYPES, happiness_by_code))
+    dropouts_by_type = dict(zip(PLAYER_TYPES, dropouts_by_code))
+
+    avg_happiness = sum(total_happiness) / total_players_online
+
+    return total_players_online, avg_happiness, active_log, total_server_latency, server_max_capacity, happiness_by_type, dropouts_by_type, disconnections
@@ -0,0 +1,208 @@
+# instrumentation.py
+import cProfile
+import glob
+import json
+import math
+import os
+import pickle
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+import numpy as np
+
+# Phases of one simulated minute in simulate_game_day, in order
+LATENCY = 0  # server full check and latency / spike draw
+SPAWN = 1    # arrivals: spawn rate, type draws, Player records
+TICK = 2     # tick every live player and swap-remove the departed ones
+SAMPLE = 3   # check_interval log point
+PHASES = ("latency", "spawn", "tick", "sample")
+
+
+class DayProfile:
+    """Per minute-bucket phase timings and player counts of simulated days.
+
+    Engines take it as `profile=` and only touch it once per phase per minute,
+    so passing None leaves the per-player loop exactly as it is. Profiles of
+    different days and workers merge by adding up.
+    """
+
+    __slots__ = ("workday_minutes", "bucket_minutes", "seconds", "spawned", "ticked", "retired", "peak_players", "days")
+
+    def __init__(self, workday_minutes=1440, bucket_minutes=60):
+        buckets = math.ceil(workday_minutes / bucket_minutes)
+        self.workday_minutes = workday_minutes
+        self.bucket_minutes = bucket_minutes
+        self.seconds = np.zeros((len(PHASES), buckets))
+        self.spawned = np.zeros(buckets, dtype=np.int64)
+        self.ticked = np.zeros(buckets, dtype=np.int64)
+        self.retired = np.zeros(buckets, dtype=np.int64)
+        self.peak_players = 0
+        self.days = 0
+
+    def lap(self, minute, phase, mark):
+        """Charges the time since `mark` to `phase` of the minute's bucket and returns a new mark."""
+        now = time.perf_counter()
+        self.seconds[phase, minute // self.bucket_minutes] += now - mark
+        return now
+
+    def count(self, minute, spawned, ticked, retired):
+        bucket = minute // self.bucket_minutes
+        self.spawned[bucket] += spawned
+        self.ticked[bucket] += ticked
+        self.retired[bucket] += retired
+        if ticked > self.peak_players:
+            self.peak_players = ticked
+
+    def merge(self, other):
+        if (self.workday_minutes, self.bucket_minutes) != (other.workday_minutes, other.bucket_minutes):
+            raise ValueError("Cannot merge profiles with different buckets")
+        self.seconds += other.seconds
+        self.spawned += other.spawned
+        self.ticked += other.ticked
+        self.retired += other.retired
+        self.peak_players = max(self.peak_players, other.peak_players)
+        self.days += other.days
+        return self
+
+    def report(self):
+        """Table of milliseconds per day and players per day for every bucket."""
+        days = max(self.days, 1)
+        lines = [
+            f"{self.days} days, peak concurrent players {self.peak_players}",
+            "minutes     " + "".join(f"{phase:>10}" for phase in PHASES) + f"{'spawned':>10}{'ticked':>10}{'retired':>10}",
+        ]
+        for bucket in range(self.seconds.shape[1]):
+            start = bucket * self.bucket_minutes
+            end = min(start + self.bucket_minutes, self.workday_minutes)
+            phase_ms = "".join(f"{1000 * self.seconds[phase, bucket] / days:>10.2f}" for phase in range(len(PHASES)))
+            counts = f"{self.spawned[bucket] / days:>10.0f}{self.ticked[bucket] / days:>10.0f}{self.retired[bucket] / days:>10.0f}"
+            lines.append(f"{start:>4}-{end:<4}   {phase_ms}{counts}")
+        total_ms = 1000 * self.seconds.sum(axis=1) / days
+        lines.append("total (ms)  " + "".join(f"{ms:>10.2f}" for ms in total_ms))
+        return "\n".join(lines)
+
+
+# What to record while simulating, and the directory every worker leaves its files in
+#   phases       DayProfile of engines that accept profile= (others are skipped)
+#   cprofile     cProfile of every simulated day, one cumulative profile per worker
+#   tracemalloc  peak traced memory per day and the top allocation sites per worker
+#   token        set per sweep, so a reused worker starts fresh records for the next sweep
+Instrumentation = namedtuple(
+    "Instrumentation", ["directory", "phases", "cprofile", "tracemalloc", "bucket_minutes", "workday_minutes", "token"],
+    defaults=[True, False, False, 60, 1440, None]
+)
+
+# Merged view of every worker's files
+InstrumentationReport = namedtuple("InstrumentationReport", ["phases", "stats", "memory"])
+
+
+class Recorder:
+    """One worker's (process or thread) instrumentation, flushed to its own files after every day."""
+
+    TOP_SITES = 25
+
+    def __init__(self, instrumentation):
+        self.instrumentation = instrumentation
+        self.prefix = os.path.join(instrumentation.directory, f"worker-{os.getpid()}-{threading.get_ident()}")
+        self.profile = DayProfile(instrumentation.workday_minutes, instrumentation.bucket_minutes) if instrumentation.phases else None
+        self.profiler = cProfile.Profile() if instrumentation.cprofile else None
+        self.memory = {"days": 0, "peak_bytes": 0, "sites": {}}
+        if instrumentation.tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def run(self, simulate, *args, **kwargs):
+        """simulate(*args, **kwargs), recorded; pass phases=False for engines without profile=."""
+        phases = kwargs.pop("phases", True)
+        if self.profile is not None and phases:
+            kwargs["profile"] = self.profile
+        if self.instrumentation.tracemalloc:
+            tracemalloc.reset_peak()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            result = simulate(*args, **kwargs)
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+        if self.instrumentation.tracemalloc:
+            self.record_memory()
+        self.flush()
+        return result
+
+    def record_memory(self):
+        memory = self.memory
+        memory["days"] += 1
+        memory["peak_bytes"] = max(memory["peak_bytes"], tracemalloc.get_traced_memory()[1])
+        sites = memory["sites"]
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        for stat in snapshot.statistics("lineno")[:self.TOP_SITES]:
+            site = str(stat.traceback)
+            sites[site] = max(sites.get(site, 0), stat.size)
+
+    def flush(self):
+        os.makedirs(self.instrumentation.directory, exist_ok=True)
+        if self.profile is not None and self.profile.days:
+            with open(self.prefix + ".phases.pkl", "wb") as f:
+                pickle.dump(self.profile, f)
+        if self.profiler is not None:
+            self.profiler.dump_stats(self.prefix + ".prof")
+        if self.instrumentation.tracemalloc:
+            with open(self.prefix + ".memory.json", "w") as f:
+                json.dump(self.memory, f)
+
+
+_recorders = {}
+
+
+def recorder(instrumentation):
+    """This worker's Recorder for `instrumentation`, created on first use."""
+    key = (instrumentation, os.getpid(), threading.get_ident())
+    if key not in _recorders:
+        _recorders[key] = Recorder(instrumentation)
+    return _recorders[key]
+
+
+def clear(directory):
+    """Removes the worker files of an earlier sweep from `directory`."""
+    for path in glob.glob(os.path.join(directory, "worker-*")):
+        os.remove(path)
+
+
+def merge_reports(directory):
+    """Merges every worker's files in `directory` into one InstrumentationReport (None where nothing was recorded)."""
+    phases = None
+    for path in sorted(glob.glob(os.path.join(directory, "worker-*.phases.pkl"))):
+        with open(path, "rb") as f:
+            profile = pickle.load(f)
+        phases = profile if phases is None else phases.merge(profile)
+
+    profiles = sorted(glob.glob(os.path.join(directory, "worker-*.prof")))
+    stats = pstats.Stats(*profiles) if profiles else None
+
+    memory = None
+    for path in sorted(glob.glob(os.path.join(directory, "worker-*.memory.json"))):
+        with open(path) as f:
+            worker = json.load(f)
+        if memory is None:
+            memory = {"days": 0, "peak_bytes": 0, "sites": {}}
+        memory["days"] += worker["days"]
+        memory["peak_bytes"] = max(memory["peak_bytes"], worker["peak_bytes"])
+        for site, size in worker["sites"].items():
+            memory["sites"][site] = max(memory["sites"].get(site, 0), size)
+    return InstrumentationReport(phases, stats, memory)
+
+
+def print_report(report, top=15):
+    if report.phases is not None:
+        print("[Phases] per simulated day")
+        print(report.phases.report())
+    if report.stats is not None:
+        print("\n[cProfile] all workers")
+        report.stats.sort_stats("cumulative").print_stats(top)
+    if report.memory is not None:
+        print(f"\n[tracemalloc] {report.memory['days']} days, peak {report.memory['peak_bytes'] / 1024:.0f} KiB in one day")
+        sites = sorted(report.memory["sites"].items(), key=lambda item: -item[1])[:top]
+        for site, size in sites:
+            print(f"{size / 1024:>10.1f} KiB  {site}")
@@ -0,0 +1,192 @@
+# jit_engine.py
+import importlib.util
+import numpy as np
+from Engine.arrivals import sample_arrivals
+from Engine.vectorized_engine import PlayerArrays, simulate_game_day_vectorized
+from Objects.archetypes import PLAYER_TYPES, archetype_table
+
+# numba is optional: without it simulate_game_day_jit is simulate_game_day_vectorized
+JIT_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+_kernels = None
+
+
+def retire_players(types, session, happiness, quit_rate, rage_quit, size, everyone,
+                   retired_types, retired_happiness, retired, dropouts):
+    """Moves every player whose session is over (all of them with `everyone`) to the retired
+    buffers from index `retired` on, counts their rage quits in dropouts and compacts the
+    live players in order. Returns (live players, retired players, rage quits).
+    """
+    kept = 0
+    rage_quits = 0
+    for i in range(size):
+        if everyone or session[i] <= 0:
+            retired_types[retired] = types[i]
+            retired_happiness[retired] = happiness[i]
+            retired += 1
+            if rage_quit[i]:
+                dropouts[types[i]] += 1
+                rage_quits += 1
+        else:
+            types[kept] = types[i]
+            session[kept] = session[i]
+            happiness[kept] = happiness[i]
+            quit_rate[kept] = quit_rate[i]
+            rage_quit[kept] = rage_quit[i]
+            kept += 1
+    return kept, retired, rage_quits
+
+
+def tick_kernel(types, session, happiness, quit_rate, rage_quit, size, is_server_full, raging,
+                steps, rage_draws, step_min, step_max, quit_step, quit_recovery):
+    """Player.tick for the first `size` players in one pass, given this minute's uniforms.
+
+    `steps` scale into [step_min, step_max] of each player's type (the loss
+    bounds when the server is full, the gain bounds otherwise); `rage_draws`
+    is only read while `raging`.
+    """
+    for i in range(size):
+        t = types[i]
+        if session[i] > 0:
+            session[i] -= 1
+
+        # Controls player happiness score according to server capacity
+        low = step_min[t]
+        step = low + np.int32(steps[i] * (step_max[t] - low + 1))
+        if is_server_full:
+            if happiness[i] > 0:
+                happiness[i] = max(happiness[i] - step, 0)
+        elif happiness[i] < 100:
+            happiness[i] = min(happiness[i] + step, 100)
+
+        # Controls player rage quits according to server latency
+        if raging:
+            quit_rate[i] += quit_step[t]
+            if rage_draws[i] < quit_rate[i]:
+                rage_quit[i] = True
+                session[i] = 0
+                happiness[i] = 0
+        elif quit_rate[i] > 0.00:
+            quit_rate[i] -= quit_recovery[t]
+
+
+def jit_kernels():
+    """(retire_players, tick_kernel) compiled by numba, or None when it is not installed.
+
+    Compiled on first use with cache=True, by calling both on empty arrays of
+    the engine's dtypes: the machine code is written to __pycache__ next to
+    this module (or NUMBA_CACHE_DIR), so later processes and every pool worker
+    load it from disk instead of compiling again.
+    """
+    global _kernels
+    if _kernels is None and JIT_AVAILABLE:
+        import numba
+        retire = numba.njit(cache=True, nogil=True)(retire_players)
+        tick = numba.njit(cache=True, nogil=True)(tick_kernel)
+        table = archetype_table()
+        players = PlayerArrays(0)
+        retire(players.type, players.session_duration, players.happiness, players.quit_rate, players.rage_quit, 0,
+               False, players.type, players.happiness, 0, np.zeros(len(PLAYER_TYPES), dtype=np.int64))
+        tick(players.type, players.session_duration, players.happiness, players.quit_rate, players.rage_quit, 0,
+             False, False, np.zeros(0), np.zeros(0), table.gain_min, table.gain_max, table.quit_step, table.quit_recovery)
+        _kernels = (retire, tick)
+    return _kernels
+
+
+def simulate_kernel_day(kernels, workday_minutes, check_interval, server_max_capacity, SERVERS, arrivals=None, rng=None, admission=None):
+    """simulate_game_day_vectorized with its retire and tick steps done by `kernels`.
+
+    Draws the same numbers in the same order as the arrays engine, so both
+    return the same day from the same rng, compiled or not.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if arrivals is None:
+        arrivals = sample_arrivals(workday_minutes, SERVERS, rng)
+    retire, tick = kernels
+    table = archetype_table()
+    arrival = 0
+    total_players_online = 0
+    disconnections = 0
+
+    # Every player of the day retires exactly once
+    retired = 0
+    retired_types = np.zeros(len(arrivals.types), dtype=np.int8)
+    retired_happiness = np.zeros(len(arrivals.types), dtype=np.int32)
+    dropouts = np.zeros(len(PLAYER_TYPES), dtype=np.int64)
+    no_draws = np.zeros(0)
+
+    players = PlayerArrays()
+    active_log = []
+    total_server_latency = []
+
+    for minute in range(workday_minutes):
+        is_server_full = players.size > server_max_capacity
+
+        current_server_latency = max(20, 40 + (players.size / 5))
+        if rng.random() < 0.01:
+            current_server_latency += int(rng.integers(100, 301))
+
+        joined = int(arrivals.counts[minute])
+        if admission is not None:
+            admission.expire(minute)
+            admission.push(arrivals.types[arrival:arrival + joined], minute, rng)
+            arrival += joined
+            admitted = admission.admit(int(server_max_capacity) - players.size, minute)
+            total_players_online += len(admitted)
+            players.spawn(np.array(admitted, dtype=np.int8), rng)
+        elif joined:
+            total_players_online += joined
+            players.spawn(arrivals.types[arrival:arrival + joined], rng)
+            arrival += joined
+
+        players.size, retired, rage_quits = retire(
+            players.type, players.session_duration, players.happiness, players.quit_rate, players.rage_quit, players.size, False,
+            retired_types, retired_happiness, retired, dropouts,
+        )
+        disconnections += rage_quits
+
+        n = players.size
+        raging = current_server_latency >= 100 and is_server_full
+        steps = rng.random(n)
+        rage_draws = rng.random(n) if raging else no_draws
+        step_min, step_max = (table.loss_min, table.loss_max) if is_server_full else (table.gain_min, table.gain_max)
+        tick(players.type, players.session_duration, players.happiness, players.quit_rate, players.rage_quit, n,
+             is_server_full, raging, steps, rage_draws, step_min, step_max, table.quit_step, table.quit_recovery)
+
+        if (minute + 1) % check_interval == 0:
+            active_log.append(players.size)
+            total_server_latency.append(current_server_latency)
+            if admission is not None:
+                admission.sample()
+
+    players.size, retired, rage_quits = retire(
+        players.type, players.session_duration, players.happiness, players.quit_rate, players.rage_quit, players.size, True,
+        retired_types, retired_happiness, retired, dropouts,
+    )
+    disconnections += rage_quits
+    if admission is not None:
+        admission.finish()
+
+    types = retired_types[:retired]
+    happiness = retired_happiness[:retired]
+    happiness_by_type = {name: happiness[types == code].tolist() for code, name in enumerate(PLAYER_TYPES)}
+    dropouts_by_type = {name: int(dropouts[code]) for code, name in enumerate(PLAYER_TYPES)}
+
+    avg_happiness = float(happiness.sum()) / total_players_online
+
+    return total_players_online, avg_happiness, active_log, total_server_latency, server_max_capacity, happiness_by_type, dropouts_by_type, disconnections
+
+
+def simulate_game_day_jit(workday_minutes, check_interval, server_max_capacity, SERVERS, arrivals=None, rng=None, admission=None):
+    """simulate_game_day_vectorized with numba-compiled tick and retire loops over the flat player arrays.
+
+    Falls back to simulate_game_day_vectorized itself when numba is missing;
+    both return the same day from the same rng.
+    """
+    kernels = jit_kernels()
+    if kernels is None:
+        return simulate_game_day_vectorized(workday_minutes, check_interval, server_max_capacity, SERVERS,
+                                            arrivals=arrivals, rng=rng, admission=admission)
+    return simulate_kernel_day(kernels, workday_minutes, check_interval, server_max_capacity, SERVERS,
+                               arrivals=arrivals, rng=rng, admission=admission)
@@ -0,0 +1,118 @@
+# login_queue.py
+import heapq
+from collections import deque
+import numpy as np
+from Objects.archetypes import PLAYER_TYPES, archetype_table
+
+
+class LoginQueue:
+    """Admission control for one simulated day: arrivals beyond the server capacity wait here.
+
+    Waiting players sit in one FIFO deque per archetype queue_priority and are
+    admitted lowest priority first; each abandons once its patience (exponential
+    with the archetype's patience_mean) runs out. Abandonment order is a heap of
+    deadlines, and abandoned or admitted entries are skipped lazily, so every
+    push, admission and abandonment is O(log n) however long the queue gets.
+
+    Engines take it as `admission=` and fill `length_log` (players waiting)
+    and `wait_log` (mean wait of the players admitted during the interval, NaN
+    when nobody was) at every check_interval, next to active_log.
+    """
+
+    def __init__(self):
+        table = archetype_table()
+        self.priority = table.queue_priority.tolist()
+        self.patience_mean = table.patience_mean
+        self.lanes = {priority: deque() for priority in sorted(set(self.priority))}
+        self.deadlines = []   # (deadline minute, ticket) heap
+        self.waiting = {}     # ticket -> type code of every player still queued
+        self.tickets = 0
+
+        self.waits = []       # minutes waited by every admitted player
+        self.admitted = np.zeros(len(PLAYER_TYPES), dtype=np.int64)
+        self.abandoned = np.zeros(len(PLAYER_TYPES), dtype=np.int64)
+        self.unserved = 0     # still queued when the day ended
+        self.length_log = []
+        self.wait_log = []
+        self.interval_waits = 0
+        self.interval_admitted = 0
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def push(self, types, minute, rng):
+        """Queues the players of type codes `types` arriving at `minute`."""
+        if len(types) == 0:
+            return
+        patience = rng.exponential(self.patience_mean[types])
+        for code, deadline in zip(np.asarray(types).tolist(), (minute + patience).tolist()):
+            ticket = self.tickets
+            self.tickets += 1
+            self.waiting[ticket] = code
+            self.lanes[self.priority[code]].append((ticket, minute))
+            heapq.heappush(self.deadlines, (deadline, ticket))
+
+    def expire(self, minute):
+        """Players whose patience ran out by `minute` leave the queue."""
+        deadlines = self.deadlines
+        while deadlines and deadlines[0][0] <= minute:
+            _, ticket = heapq.heappop(deadlines)
+            code = self.waiting.pop(ticket, None)
+            if code is not None:
+                self.abandoned[code] += 1
+
+    def admit(self, slots, minute):
+        """Type codes of up to `slots` players let in at `minute`, best priority first."""
+        admitted = []
+        for lane in self.lanes.values():
+            while lane and len(admitted) < slots:
+                ticket, joined = lane.popleft()
+                code = self.waiting.pop(ticket, None)
+                if code is None:
+                    continue  # abandoned earlier
+                admitted.append(code)
+                self.admitted[code] += 1
+                self.waits.append(minute - joined)
+                self.interval_waits += minute - joined
+            if len(admitted) >= slots:
+                break
+        self.interval_admitted += len(admitted)
+        return admitted
+
+    def sample(self):
+        """Appends the check_interval log points."""
+        self.length_log.append(len(self.waiting))
+        self.wait_log.append(self.interval_waits / self.interval_admitted if self.interval_admitted else float("nan"))
+        self.interval_waits = 0
+        self.interval_admitted = 0
+
+    def finish(self):
+        """Ends the day: players still queued count as unserved and the queue structures are released."""
+        self.unserved = len(self.waiting)
+        self.waiting = {}
+        self.lanes = {priority: deque() for priority in self.lanes}
+        self.deadlines = []
+
+    def summary(self, percentiles=(50, 90, 99)):
+        return queue_summary([self], percentiles)
+
+
+def queue_summary(queues, percentiles=(50, 90, 99)):
+    """Pooled wait and queue-length percentiles, admissions and abandonments of finished LoginQueues."""
+    waits = np.concatenate([np.asarray(queue.waits, dtype=np.float64) for queue in queues])
+    lengths = np.concatenate([np.asarray(queue.length_log, dtype=np.float64) for queue in queues])
+    admitted = sum(queue.admitted for queue in queues)
+    abandoned = sum(queue.abandoned for queue in queues)
+    unserved = sum(queue.unserved for queue in queues)
+    arrived = admitted.sum() + abandoned.sum() + unserved
+    return {
+        "admitted": int(admitted.sum()),
+        "abandoned": int(abandoned.sum()),
+        "unserved": unserved,
+        "abandonment_rate": float(abandoned.sum() / arrived) if arrived else 0.0,
+        "abandoned_by_type": {name: int(abandoned[code]) for code, name in enumerate(PLAYER_TYPES)},
+        "mean_wait": float(waits.mean()) if len(waits) else 0.0,
+        "wait_percentiles": {p: float(np.percentile(waits, p)) if len(waits) else 0.0 for p in percentiles},
+        "length_percentiles": {p: float(np.percentile(lengths, p)) if len(lengths) else 0.0 for p in percentiles},
+        "max_length": int(lengths.max()) if len(lengths) else 0,
+    }
@@ -0,0 +1,69 @@
+# sampling.py
+import numpy as np
+from Engine.seeding import capacity_rng
+
+# uniform     independent uniform capacities, one RNG stream per run (plain Monte Carlo)
+# crn         common random numbers: every run of a replicate reuses the same arrival
+#             and behaviour stream, so differences between runs come from capacity only
+# antithetic  capacities drawn in mirrored pairs u, 1 - u
+# lhs         Latin hypercube (stratified) capacities: one draw per equal-width stratum
+SAMPLING_MODES = ("uniform", "crn", "antithetic", "lhs")
+
+
+def unit_sample(mode, size, rng):
+    """`size` points in [0, 1) laid out according to the sampling mode."""
+    if mode in ("uniform", "crn"):
+        return rng.random(size)
+    if mode == "antithetic":
+        half = rng.random((size + 1) // 2)
+        u = np.empty(size)
+        u[0::2] = half
+        u[1::2] = 1.0 - half[:size // 2]
+        return u
+    if mode == "lhs":
+        return (rng.permutation(size) + rng.random(size)) / size
+    raise ValueError(f"Unknown sampling mode: {mode}")
+
+
+def capacity_plan(mode, seed, runs, minimum_capacity, maximum_capacity, replicates=1):
+    """Capacities and RNG streams for a sweep of `runs` days.
+
+    The runs are split into `replicates` independent groups, each laid out
+    with the sampling mode on its own. Returns (capacities, streams, groups):
+    run i simulates capacities[i] with Engine.seeding.run_rng(seed, streams[i])
+    and belongs to replicate groups[i].
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {mode}")
+    rng = capacity_rng(seed)
+    capacities = np.empty(runs)
+    streams = np.arange(runs)
+    groups = np.empty(runs, dtype=np.int64)
+    for group, runs_in_group in enumerate(np.array_split(np.arange(runs), replicates)):
+        u = unit_sample(mode, len(runs_in_group), rng)
+        capacities[runs_in_group] = minimum_capacity + (maximum_capacity - minimum_capacity) * u
+        groups[runs_in_group] = group
+        if mode == "crn" and len(runs_in_group):
+            streams[runs_in_group] = runs_in_group[0]
+    return capacities, streams, groups
+
+
+def variance_reduction_factor(values, groups):
+    """Achieved variance reduction of the mean of `values` over independent sampling.
+
+    Compares the observed spread of the replicate means with what independent
+    runs of the same size would give (sample variance / runs per replicate).
+    Above 1 means the mode needs that many times fewer runs for the same
+    confidence. Needs at least two replicates; returns nan otherwise.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups)
+    labels = np.unique(groups)
+    if len(labels) < 2:
+        return float("nan")
+    group_means = np.array([values[groups == label].mean() for label in labels])
+    observed = np.var(group_means, ddof=1)
+    independent = np.var(values, ddof=1) / (len(values) / len(labels))
+    if observed == 0:
+        return float("inf") if independent > 0 else float("nan")
+    return float(independent / observed)
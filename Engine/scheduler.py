@@ -0,0 +1,150 @@
+# scheduler.py
+import atexit
+import math
+import os
+import time
+from multiprocessing import Pool
+
+
+def available_workers():
+    """CPUs this process may run on (respects taskset / container CPU pinning)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_chunksize(tasks, workers, chunks_per_worker=4):
+    """Small enough that every worker gets several chunks to even out the tail, large enough to amortise IPC."""
+    return max(1, math.ceil(tasks / (workers * chunks_per_worker)))
+
+
+def balanced_order(costs):
+    """Task positions, most expensive first (longest-processing-time rule).
+
+    Handing the heavy days out first and the light ones last lets the
+    dynamically scheduled tail fill the gaps instead of leaving one worker
+    finishing a long day on its own.
+    """
+    return sorted(range(len(costs)), key=lambda position: -costs[position])
+
+
+class Progress:
+    """Rate-limited "done / total, days/s, ETA" line instead of a print per day."""
+
+    def __init__(self, total, label="Progress", interval=2.0):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.done = 0
+        self.start = time.perf_counter()
+        self.last_report = self.start
+
+    def update(self, count=1):
+        self.done += count
+        now = time.perf_counter()
+        # Short jobs that finish within one interval stay silent
+        finished = self.done == self.total and now - self.start >= self.interval
+        if finished or now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        elapsed = (now or time.perf_counter()) - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else float("inf")
+        eta_text = f"{int(eta // 60)}:{int(eta % 60):02d}" if math.isfinite(eta) else "?"
+        print(f"[{self.label}] {self.done}/{self.total} ({100 * self.done / self.total:.0f}%), "
+              f"{rate:.1f} days/s, ETA {eta_text}")
+
+
+def _indexed_call(item):
+    position, func, task = item
+    return position, func(task)
+
+
+class Scheduler:
+    """Process pool that stays warm across sweeps and hands out work in chunks with imap_unordered.
+
+    The pool is started on first use and reused by every later run() until
+    close(), so repeated sweeps in one session do not pay the start-up and
+    import cost again (see session_scheduler). close() waits for the workers
+    to finish; terminate() kills them, and is what happens when run() or a
+    with block is left by an exception, Ctrl-C included. Worker functions
+    must be importable (module level).
+    """
+
+    def __init__(self, workers=None, chunksize=None, progress_interval=2.0):
+        self.workers = workers or available_workers()
+        self.chunksize = chunksize
+        self.progress_interval = progress_interval
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def run(self, func, tasks, costs=None, chunksize=None, label="Progress"):
+        """func(task) for every task, returned in task order.
+
+        `costs` (one number per task, e.g. server capacity) puts the heaviest
+        tasks first; `chunksize` overrides the scheduler's and the default.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        if self.pool is None:
+            self.pool = Pool(processes=self.workers)
+        order = balanced_order(costs) if costs is not None else range(len(tasks))
+        chunksize = chunksize or self.chunksize or default_chunksize(len(tasks), self.workers)
+
+        results = [None] * len(tasks)
+        progress = Progress(len(tasks), label, self.progress_interval)
+        items = ((position, func, tasks[position]) for position in order)
+        try:
+            for position, result in self.pool.imap_unordered(_indexed_call, items, chunksize=chunksize):
+                results[position] = result
+                progress.update()
+        except BaseException:
+            # Workers may still be busy with the rest of the tasks: a join would wait for them, or forever
+            self.terminate()
+            raise
+        return results
+
+    def worker_pids(self):
+        """Process ids of the live workers (none before the first run())."""
+        return [process.pid for process in self.pool._pool] if self.pool is not None else []
+
+    def close(self):
+        """Lets the workers finish and waits for them."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def terminate(self):
+        """Stops the workers at once, whatever they are doing."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+
+_session_schedulers = {}
+
+
+def session_scheduler(workers=None, chunksize=None):
+    """This session's Scheduler for (workers, chunksize), created on first use and closed at interpreter exit.
+
+    Every sweep, plan, queue and cluster comparison of one process asks for
+    its pool here, so they share warm workers instead of each starting its own.
+    """
+    key = (workers or available_workers(), chunksize)
+    if key not in _session_schedulers:
+        _session_schedulers[key] = Scheduler(*key)
+        atexit.register(_session_schedulers[key].close)
+    return _session_schedulers[key]
@@ -0,0 +1,24 @@
+# seeding.py
+import numpy as np
+
+# Child streams of the root SeedSequence, keyed by spawn_key
+RUN_STREAM = 0       # (RUN_STREAM, run_index): everything random inside one simulated day
+CAPACITY_STREAM = 1  # (CAPACITY_STREAM,): the server capacity sample of a whole sweep
+
+
+def run_rng(seed, run_index):
+    """Generator for simulated day `run_index` of the sweep started with `seed`.
+
+    The stream depends only on (seed, run_index), so a day draws the same
+    numbers whichever driver, worker or chunk ends up running it.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(RUN_STREAM, run_index)))
+
+
+def capacity_rng(seed):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(CAPACITY_STREAM,)))
+
+
+def sample_capacities(seed, runs, minimum_capacity, maximum_capacity):
+    """Uniform server_max_capacity sample for a sweep; generate once in the parent and pass it down."""
+    return capacity_rng(seed).uniform(minimum_capacity, maximum_capacity, runs)
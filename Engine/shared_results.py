@@ -0,0 +1,155 @@
+# shared_results.py
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+from Engine.accumulators import DistributionSummary, HAPPINESS_BINS
+from Objects.archetypes import PLAYER_TYPES
+
+# Per-run scalars, one column each, followed by dropouts_<type> for every archetype
+SCALAR_COLUMNS = ("tpo", "avg_happy", "smc", "drop_out")
+
+# What a worker needs to attach to the parent's block: (block name, runs, intervals, types, bins)
+SharedSpec = namedtuple("SharedSpec", ["name", "runs", "intervals", "types", "bins"])
+
+
+def scalar_columns():
+    return SCALAR_COLUMNS + tuple(f"dropouts_{t}" for t in PLAYER_TYPES)
+
+
+def _layout(runs, intervals, types, bins):
+    """(field, dtype, shape) of every array in the block, in order."""
+    return [
+        ("log", np.float64, (runs, intervals)),
+        ("tsl", np.float64, (runs, intervals)),
+        ("scalars", np.float64, (runs, len(SCALAR_COLUMNS) + types)),
+        ("happiness", np.int32, (runs, types, bins)),
+        ("written", np.bool_, (runs,)),
+    ]
+
+
+class ResultRows:
+    """Read accessors shared by every run-indexed result table.
+
+    Subclasses provide log, tsl (runs, intervals), scalars (runs, K) and
+    happiness (runs, types, bins) arrays.
+    """
+
+    def column(self, name):
+        """(runs,) view of one scalar column, e.g. column("avg_happy")."""
+        return self.scalars[:, scalar_columns().index(name)]
+
+    def dropouts(self, run_index):
+        return dict(zip(PLAYER_TYPES, self.scalars[run_index, len(SCALAR_COLUMNS):].astype(int).tolist()))
+
+    def day(self, run_index):
+        """Row `run_index` in simulate_game_day's tuple layout (happiness as per-type summaries)."""
+        tpo, avg_happy, smc, drop_out = self.scalars[run_index, :len(SCALAR_COLUMNS)]
+        low, high, _ = HAPPINESS_BINS
+        hbt = {
+            t: DistributionSummary.from_counts(self.happiness[run_index, code], low, high)
+            for code, t in enumerate(PLAYER_TYPES)
+        }
+        return (
+            int(tpo), float(avg_happy), self.log[run_index], self.tsl[run_index],
+            float(smc), hbt, self.dropouts(run_index), int(drop_out)
+        )
+
+    def happiness_by_type(self, runs=None):
+        """Per-type DistributionSummary over the first `runs` rows (all rows by default)."""
+        counts = self.happiness[:runs].sum(axis=0)
+        low, high, _ = HAPPINESS_BINS
+        return {t: DistributionSummary.from_counts(counts[code], low, high) for code, t in enumerate(PLAYER_TYPES)}
+
+
+class SharedResults(ResultRows):
+    """Run-indexed result arrays living in one multiprocessing.shared_memory block.
+
+    The parent creates the block, workers attach to it by name and write the
+    row of the day they simulated, and the parent reads everything back as
+    NumPy views of the same memory, so no result is pickled through a pipe.
+
+        log, tsl    (runs, intervals) active log / total server latency
+        scalars     (runs, K) columns listed by scalar_columns()
+        happiness   (runs, types, bins) final happiness histogram per type
+        written     (runs,) set once a worker has filled the row
+    """
+
+    def __init__(self, spec, create=False):
+        layout = _layout(spec.runs, spec.intervals, spec.types, spec.bins)
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+        if create:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            spec = spec._replace(name=self.memory.name)
+        else:
+            # Pool workers share the parent's resource tracker, so attaching
+            # does not hand ownership of the block to the worker
+            self.memory = shared_memory.SharedMemory(name=spec.name)
+        self.spec = spec
+
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if create:
+            self.written[:] = False
+
+    @classmethod
+    def create(cls, runs, intervals):
+        return cls(SharedSpec(None, runs, intervals, len(PLAYER_TYPES), HAPPINESS_BINS[2]), create=True)
+
+    def write(self, run_index, result):
+        """Stores one simulate_game_day result tuple in row `run_index`."""
+        tpo, avg_happy, log, tsl, smc, hbt, dbt, drop_out = result
+        self.log[run_index] = log
+        self.tsl[run_index] = tsl
+        self.scalars[run_index, :len(SCALAR_COLUMNS)] = (tpo, avg_happy, smc, drop_out)
+        self.scalars[run_index, len(SCALAR_COLUMNS):] = [dbt[t] for t in PLAYER_TYPES]
+        low, high, bins = HAPPINESS_BINS
+        width = (high - low) / bins
+        for code, t in enumerate(PLAYER_TYPES):
+            values = np.asarray(hbt[t], dtype=np.float64)
+            index = np.clip(((values - low) / width).astype(np.int64), 0, bins - 1)
+            self.happiness[run_index, code] = np.bincount(index, minlength=bins)
+        self.written[run_index] = True
+
+    def write_days(self, start, result):
+        """Stores a simulate_game_days result in rows start .. start + D - 1.
+
+        Happiness is not copied: pass happiness[start:start + D] to the engine
+        as happiness_counts so it fills those rows itself.
+        """
+        tpo, avg_happy, log, tsl, smc, _, dbt, drop_out = result
+        rows = slice(start, start + len(tpo))
+        self.log[rows] = log
+        self.tsl[rows] = tsl
+        self.scalars[rows, :len(SCALAR_COLUMNS)] = np.column_stack((tpo, avg_happy, smc, drop_out))
+        self.scalars[rows, len(SCALAR_COLUMNS):] = dbt
+        self.written[rows] = True
+
+    def close(self):
+        """Unmaps the block; every view handed out must have been dropped first."""
+        for field, _, _ in _layout(*self.spec[1:]):
+            setattr(self, field, None)
+        self.memory.close()
+
+    def unlink(self):
+        """Removes the block's name; the parent's existing views stay valid until it exits."""
+        self.memory.unlink()
+
+
+_attached = None
+
+
+def attach(spec):
+    """This process' SharedResults for `spec`, attaching on first use.
+
+    Lets warm pool workers serve several sweeps: a task names the block it
+    writes to, and a worker drops its previous block when a new one shows up.
+    """
+    global _attached
+    if _attached is None or _attached.spec.name != spec.name:
+        if _attached is not None:
+            _attached.close()
+        _attached = SharedResults(spec)
+    return _attached
@@ -1,15 +1,13 @@
 # simulation_engine.py
-import random
+from time import perf_counter
 import numpy as np
-from Objects.player import Player  # if Player is in another file
+from Engine.instrumentation import LATENCY, SPAWN, TICK, SAMPLE
+from Objects.archetypes import PLAYER_TYPES, type_sampler
+from Objects.player_pool import PlayerPool
 
-def get_random_type():
-    # You can change the probability distribution here
-    return random.choices(
-        ["idler", "casual", "pro"],
-        weights=[0.3, 0.5, 0.2],  # 30% idlers, 50% casuals, 20% pros
-        k=1
-    )[0]
+def get_random_type(rng):
+    # You can change the probability distribution in Objects/archetypes.py
+    return PLAYER_TYPES[type_sampler().draw(rng)]
     
 def get_spawn_rate(minute, base_rate=5, peak_rate=15, peak_minute=720, spread=200):
     """Returns estimated player spawn rate based on Gaussian curve"""
@@ -32,60 +30,124 @@ def data_debug(total_players_online,
     print(f"Disconnections: {disconnections} || {dropouts_by_type}")
 
 
-def simulate_game_day(workday_minutes, check_interval, server_max_capacity, SERVERS):
+def simulate_game_day(workday_minutes, check_interval, server_max_capacity, SERVERS, arrivals=None, rng=None, profile=None, admission=None):
+    """Simulates one day with Player objects.
+
+    `arrivals` is an optional pre-sampled Engine.arrivals.ArrivalSchedule; when
+    given it replaces the per-minute spawn draws. `rng` is the day's
+    numpy.random.Generator (see Engine.seeding.run_rng); every random draw of
+    the day comes from it.
+
+    `profile` is an optional Engine.instrumentation.DayProfile that receives
+    per-phase timings and player counts; it is consulted once per phase per
+    minute, never per player.
+
+    `admission` is an optional Engine.login_queue.LoginQueue: arrivals then only
+    join while the server has room and otherwise wait in it (or abandon), and
+    it logs the queue at every check_interval. Arrivals are pre-sampled then.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if admission is not None and arrivals is None:
+        from Engine.arrivals import sample_arrivals  # imports this module
+        arrivals = sample_arrivals(workday_minutes, SERVERS, rng)
     total_players_online = 0
     new_players = 0
     disconnections = 0
     
-    happiness_by_type = {"idler": [], "casual": [], "pro": []}
-    dropouts_by_type = {"idler": 0, "casual": 0, "pro": 0}
+    # Per-type metrics, indexed by type code
+    happiness_by_code = [[] for _ in PLAYER_TYPES]
+    dropouts_by_code = [0] * len(PLAYER_TYPES)
     
-    players = []
+    players = PlayerPool()
     active_log = []
     total_happiness = []
     total_server_latency = []
+    arrival = 0
     
     for minute in range(workday_minutes):
+        if profile is not None:
+            mark = perf_counter()
+            joined_before = total_players_online
         is_server_full = len(players) > server_max_capacity  
         
         current_server_latency = max(20, 40 + (len(players) / 5))
-        if random.random() < 0.01:
-            current_server_latency += random.randint(100, 300)
+        if rng.random() < 0.01:
+            current_server_latency += int(rng.integers(100, 301))
+        if profile is not None:
+            mark = profile.lap(minute, LATENCY, mark)
         
-        if random.random() < 0.6:
+        if admission is not None:
+            admission.expire(minute)
+            admission.push(arrivals.types[arrival:arrival + arrivals.counts[minute]], minute, rng)
+            arrival += arrivals.counts[minute]
+            for code in admission.admit(int(server_max_capacity) - len(players), minute):
+                total_players_online += 1
+                players.spawn(PLAYER_TYPES[code], rng)
+        elif arrivals is not None:
+            for _ in range(arrivals.counts[minute]):
+                total_players_online += 1
+                players.spawn(PLAYER_TYPES[arrivals.types[arrival]], rng)
+                arrival += 1
+        elif rng.random() < 0.6:
             spawn_rate = get_spawn_rate(minute)
-            new_players = np.abs(random.gauss(spawn_rate, 5)).astype(int)
+            new_players = np.abs(rng.normal(spawn_rate, 5)).astype(int)
             
             for _ in range(new_players):
-                if random.random() <= 1 / SERVERS:
+                if rng.random() <= 1 / SERVERS:
                     total_players_online += 1
-                    player_type = get_random_type()
-                    players.append(Player(player_type))
+                    player_type = get_random_type(rng)
+                    players.spawn(player_type, rng)
+        if profile is not None:
+            mark = profile.lap(minute, SPAWN, mark)
+            live_before = players.size
                 
-        active_players = []
-        for player in players:
+        # Departed players are swap-removed, so the slot is re-checked after a retirement
+        records = players.players
+        index = 0
+        while index < players.size:
+            player = records[index]
             if player.is_active():
-                player.tick(is_server_full, current_server_latency)
-                active_players.append(player)
+                player.tick(is_server_full, current_server_latency, rng)
+                index += 1
             else:
-                total_happiness.append(player.get_happiness())
-                happiness_by_type[player.type].append(player.get_happiness())
-                if player.is_rage_quit():
-                    dropouts_by_type[player.type] += 1
+                total_happiness.append(player.happiness)
+                happiness_by_code[player.type_code].append(player.happiness)
+                if player.rage_quit:
+                    dropouts_by_code[player.type_code] += 1
                     disconnections += 1
-        players = active_players
+                players.retire(index)
+        if profile is not None:
+            mark = profile.lap(minute, TICK, mark)
+            profile.count(minute, total_players_online - joined_before, players.size, live_before - players.size)
         
         if (minute + 1) % check_interval == 0:
             active_log.append(len(players))
             total_server_latency.append(current_server_latency)
+            if admission is not None:
+                admission.sample()
+        if profile is not None:
+            profile.lap(minute, SAMPLE, mark)
         
+    if profile is not None:
+        mark = perf_counter()
+        profile.count(workday_minutes - 1, 0, 0, players.size)
     for player in players:
         total_happiness.append(player.get_happiness())
-        happiness_by_type[player.type].append(player.get_happiness())
+        happiness_by_code[player.type_code].append(player.get_happiness())
         if player.is_rage_quit():
-            dropouts_by_type[player.type] += 1
+            dropouts_by_code[player.type_code] += 1
             disconnections += 1
     
+    if profile is not None:
+        profile.lap(workday_minutes - 1, TICK, mark)
+        profile.days += 1
+    if admission is not None:
+        admission.finish()
+    
+    happiness_by_type = dict(zip(PLAYER_TYPES, happiness_by_code))
+    dropouts_by_type = dict(zip(PLAYER_TYPES, dropouts_by_code))
+    
     avg_happiness = sum(total_happiness) / total_players_online
 
     return total_players_online, avg_happiness, active_log, total_server_latency, server_max_capacity, happiness_by_type, dropouts_by_type, disconnections
\ No newline at end of file
@@ -0,0 +1,140 @@
+# trace_store.py
+import json
+import os
+import time
+import numpy as np
+from Engine.accumulators import HAPPINESS_BINS
+from Engine.shared_results import ResultRows, SCALAR_COLUMNS, scalar_columns
+from Objects.archetypes import PLAYER_TYPES
+
+MANIFEST = "manifest.json"
+TRACE_VERSION = 1
+
+
+def _layout(runs, minutes, types, bins):
+    """(array, dtype, shape) of every recorded .npy file."""
+    return [
+        ("active", np.int32, (runs, minutes)),      # players online at the end of every minute
+        ("latency", np.float32, (runs, minutes)),   # server latency of every minute
+        ("scalars", np.float64, (runs, len(SCALAR_COLUMNS) + types)),
+        ("happiness", np.int32, (runs, types, bins)),
+        ("streams", np.int64, (runs,)),             # run_rng stream of every run
+        ("groups", np.int64, (runs,)),              # replicate group of every run
+    ]
+
+
+class TraceWriter:
+    """Writes per-run results into memory-mapped .npy files in `directory`.
+
+    Rows can be written in any order and any number of batches; the JSON
+    manifest is written last by close(), so a directory without one holds an
+    unfinished recording.
+    """
+
+    def __init__(self, directory, runs, minutes):
+        os.makedirs(directory, exist_ok=True)
+        manifest = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+        self.directory = directory
+        self.runs = runs
+        self.minutes = minutes
+        self.arrays = {
+            name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+            for name, dtype, shape in _layout(runs, minutes, len(PLAYER_TYPES), HAPPINESS_BINS[2])
+        }
+
+    def write_rows(self, start, **columns):
+        """Rows start .. start + n - 1 of the named arrays, e.g. write_rows(0, active=..., latency=...)."""
+        for name, values in columns.items():
+            self.arrays[name][start:start + len(values)] = values
+
+    def close(self, **manifest):
+        """Flushes every file and writes the manifest (extra JSON-ready fields in `manifest`)."""
+        for array in self.arrays.values():
+            array.flush()
+        manifest = {
+            "version": TRACE_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": self.runs,
+            "minutes": self.minutes,
+            "player_types": list(PLAYER_TYPES),
+            "scalar_columns": list(scalar_columns()),
+            "happiness_bins": list(HAPPINESS_BINS),
+            "arrays": {name: {"file": f"{name}.npy", "dtype": array.dtype.str, "shape": list(array.shape)}
+                       for name, array in self.arrays.items()},
+            **manifest,
+        }
+        self.arrays = {}
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+        return manifest
+
+
+class TraceStore(ResultRows):
+    """A finished recording, memory-mapped lazily.
+
+    Opening reads only the manifest; every array is mapped on first access and
+    slices are paged in from disk on demand. log and tsl are the per-minute
+    arrays sampled every `check_interval` minutes, as views, so the store stands
+    in for a SharedResults table in Runner.analysis.
+    """
+
+    def __init__(self, directory, check_interval=None):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest["version"] != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {self.manifest['version']} in {directory}")
+        if self.manifest["player_types"] != list(PLAYER_TYPES):
+            raise ValueError(f"Recorded player types {self.manifest['player_types']} differ from the registry")
+        self.check_interval = check_interval or self.manifest.get("params", {}).get("check_interval", 1)
+        self.mapped = {}
+
+    def array(self, name):
+        if name not in self.mapped:
+            entry = self.manifest["arrays"][name]
+            self.mapped[name] = np.load(os.path.join(self.directory, entry["file"]), mmap_mode="r")
+        return self.mapped[name]
+
+    @property
+    def runs(self):
+        return self.manifest["runs"]
+
+    @property
+    def minutes(self):
+        return self.manifest["minutes"]
+
+    @property
+    def active(self):
+        return self.array("active")
+
+    @property
+    def latency(self):
+        return self.array("latency")
+
+    @property
+    def scalars(self):
+        return self.array("scalars")
+
+    @property
+    def happiness(self):
+        return self.array("happiness")
+
+    @property
+    def streams(self):
+        return self.array("streams")
+
+    @property
+    def groups(self):
+        return self.array("groups")
+
+    @property
+    def log(self):
+        return self.active[:, self.check_interval - 1::self.check_interval]
+
+    @property
+    def tsl(self):
+        return self.latency[:, self.check_interval - 1::self.check_interval]
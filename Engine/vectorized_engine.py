@@ -0,0 +1,168 @@
+# vectorized_engine.py
+import numpy as np
+from Engine.arrivals import sample_arrivals
+from Objects.archetypes import PLAYER_TYPES, archetype_table
+
+
+def random_steps(low, high, rng):
+    """Uniform integers in [low, high] per element, like random.randint with array bounds."""
+    return low + (rng.random(np.shape(low)) * (high - low + 1)).astype(np.int32)
+
+
+def session_durations(types, rng):
+    """Session length of newly joined players, mirroring Player.reset"""
+    table = archetype_table()
+    sessions = rng.normal(table.session_mean[types], table.session_stddev[types])
+    return np.maximum(1, np.trunc(sessions).astype(np.int32))
+
+
+class PlayerArrays:
+    """Structure-of-arrays storage for every player currently on the server."""
+
+    # Per-player columns and their dtypes; subclasses may add columns
+    FIELDS = (
+        ("type", np.int8),
+        ("session_duration", np.int32),
+        ("happiness", np.int32),
+        ("quit_rate", np.float64),
+        ("rage_quit", bool),
+    )
+
+    def __init__(self, capacity=256):
+        self.size = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(self.type))
+        for name, _ in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def spawn(self, types, rng):
+        """Appends new players of the given type codes, mirroring Player.__init__"""
+        count = len(types)
+        if count == 0:
+            return
+        if self.size + count > len(self.type):
+            self._grow(self.size + count)
+        start, end = self.size, self.size + count
+        self.type[start:end] = types
+        self.session_duration[start:end] = session_durations(types, rng)
+        self.happiness[start:end] = 100
+        self.quit_rate[start:end] = 0
+        self.rage_quit[start:end] = False
+        self.size = end
+
+    def compact(self, keep):
+        """Drops every player whose entry in `keep` is False, preserving order."""
+        kept = int(np.count_nonzero(keep))
+        for name, _ in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:kept] = arr[:self.size][keep]
+        self.size = kept
+
+
+def tick_players(players, is_server_full, current_server_latency, rng):
+    """Whole-array equivalent of Player.tick for every stored player."""
+    table = archetype_table()
+    n = players.size
+    types = players.type[:n]
+    session = players.session_duration[:n]
+    happiness = players.happiness[:n]
+    quit_rate = players.quit_rate[:n]
+
+    session[session > 0] -= 1
+
+    # Controls player happiness score according to server capacity
+    if is_server_full:
+        step = random_steps(table.loss_min[types], table.loss_max[types], rng)
+        np.maximum(happiness - np.where(happiness > 0, step, 0), 0, out=happiness)
+    else:
+        step = random_steps(table.gain_min[types], table.gain_max[types], rng)
+        np.minimum(happiness + np.where(happiness < 100, step, 0), 100, out=happiness)
+
+    # Controls player rage quits according to server latency
+    if current_server_latency >= 100 and is_server_full:
+        quit_rate += table.quit_step[types]
+        rage = rng.random(n) < quit_rate
+        players.rage_quit[:n] |= rage
+        session[rage] = 0
+        happiness[rage] = 0
+    else:
+        recovering = quit_rate > 0.00
+        quit_rate[recovering] -= table.quit_recovery[types[recovering]]
+
+
+def simulate_game_day_vectorized(workday_minutes, check_interval, server_max_capacity, SERVERS, arrivals=None, rng=None, admission=None):
+    """Array based drop-in replacement for simulate_game_day (same return tuple, same `admission`)."""
+    if rng is None:
+        rng = np.random.default_rng()
+    if arrivals is None:
+        arrivals = sample_arrivals(workday_minutes, SERVERS, rng)
+    arrival = 0
+    total_players_online = 0
+    disconnections = 0
+
+    retired_types = []
+    retired_happiness = []
+    dropouts = np.zeros(len(PLAYER_TYPES), dtype=np.int64)
+
+    players = PlayerArrays()
+    active_log = []
+    total_server_latency = []
+
+    def retire(mask):
+        types = players.type[:players.size][mask]
+        retired_types.append(types)
+        retired_happiness.append(players.happiness[:players.size][mask])
+        rage_types = types[players.rage_quit[:players.size][mask]]
+        dropouts[:] += np.bincount(rage_types, minlength=len(PLAYER_TYPES))
+        return len(rage_types)
+
+    for minute in range(workday_minutes):
+        is_server_full = players.size > server_max_capacity
+
+        current_server_latency = max(20, 40 + (players.size / 5))
+        if rng.random() < 0.01:
+            current_server_latency += int(rng.integers(100, 301))
+
+        joined = int(arrivals.counts[minute])
+        if admission is not None:
+            admission.expire(minute)
+            admission.push(arrivals.types[arrival:arrival + joined], minute, rng)
+            arrival += joined
+            admitted = admission.admit(int(server_max_capacity) - players.size, minute)
+            total_players_online += len(admitted)
+            players.spawn(np.array(admitted, dtype=np.int8), rng)
+        elif joined:
+            total_players_online += joined
+            players.spawn(arrivals.types[arrival:arrival + joined], rng)
+            arrival += joined
+
+        active = players.session_duration[:players.size] > 0
+        if not active.all():
+            disconnections += retire(~active)
+            players.compact(active)
+        tick_players(players, is_server_full, current_server_latency, rng)
+
+        if (minute + 1) % check_interval == 0:
+            active_log.append(players.size)
+            total_server_latency.append(current_server_latency)
+            if admission is not None:
+                admission.sample()
+
+    disconnections += retire(np.ones(players.size, dtype=bool))
+    if admission is not None:
+        admission.finish()
+
+    types = np.concatenate(retired_types)
+    happiness = np.concatenate(retired_happiness)
+    happiness_by_type = {name: happiness[types == code].tolist() for code, name in enumerate(PLAYER_TYPES)}
+    dropouts_by_type = {name: int(dropouts[code]) for code, name in enumerate(PLAYER_TYPES)}
+
+    avg_happiness = float(happiness.sum()) / total_players_online
+
+    return total_players_online, avg_happiness, active_log, total_server_latency, server_max_capacity, happiness_by_type, dropouts_by_type, disconnections
@@ -0,0 +1,120 @@
+from collections import namedtuple
+import numpy as np
+
+# One entry per player archetype; its position in ARCHETYPES is its integer type code.
+#   spawn_weight      relative share of arrivals
+#   session_mean/std  gauss parameters of the session length in minutes (min 1)
+#   happiness_gain    (min, max) happiness regained per minute while the server is not full
+#   happiness_loss    (min, max) happiness lost per minute while the server is full
+#   quit_step         quit_rate increase per minute of full server with latency >= 100
+#   quit_recovery     quit_rate decrease per minute otherwise
+#   queue_priority    login queue order under admission control, lower is admitted first
+#   patience_mean     mean minutes a queued player waits before abandoning (exponential)
+Archetype = namedtuple("Archetype", [
+    "name", "spawn_weight", "session_mean", "session_stddev",
+    "happiness_gain", "happiness_loss", "quit_step", "quit_recovery",
+    "queue_priority", "patience_mean",
+], defaults=[0, 10.0])
+
+# Type codes are stored as int8 in every player array, so at most 128 archetypes
+MAX_ARCHETYPES = int(np.iinfo(np.int8).max) + 1
+
+ARCHETYPES = []
+PLAYER_TYPES = []  # archetype names, indexed by type code
+TYPE_CODES = {}    # archetype name -> type code
+
+# Array views of the registry, rebuilt lazily after a registration
+ArchetypeTable = namedtuple("ArchetypeTable", [
+    "spawn_weight", "session_mean", "session_stddev",
+    "gain_min", "gain_max", "loss_min", "loss_max", "quit_step", "quit_recovery",
+    "queue_priority", "patience_mean",
+])
+_table = None
+_alias = None
+
+
+def register_archetype(archetype):
+    """Adds an archetype to the registry and returns its type code."""
+    global _table, _alias
+    if archetype.name in TYPE_CODES:
+        raise ValueError(f"Archetype already registered: {archetype.name}")
+    if len(ARCHETYPES) >= MAX_ARCHETYPES:
+        raise ValueError(f"At most {MAX_ARCHETYPES} archetypes can be registered (int8 type codes)")
+    code = len(ARCHETYPES)
+    ARCHETYPES.append(archetype)
+    PLAYER_TYPES.append(archetype.name)
+    TYPE_CODES[archetype.name] = code
+    _table = None
+    _alias = None
+    return code
+
+
+def archetype_table():
+    """Per type code NumPy arrays of every archetype parameter."""
+    global _table
+    if _table is None:
+        _table = ArchetypeTable(
+            spawn_weight=np.array([a.spawn_weight for a in ARCHETYPES], dtype=np.float64),
+            session_mean=np.array([a.session_mean for a in ARCHETYPES], dtype=np.float64),
+            session_stddev=np.array([a.session_stddev for a in ARCHETYPES], dtype=np.float64),
+            gain_min=np.array([a.happiness_gain[0] for a in ARCHETYPES], dtype=np.int32),
+            gain_max=np.array([a.happiness_gain[1] for a in ARCHETYPES], dtype=np.int32),
+            loss_min=np.array([a.happiness_loss[0] for a in ARCHETYPES], dtype=np.int32),
+            loss_max=np.array([a.happiness_loss[1] for a in ARCHETYPES], dtype=np.int32),
+            quit_step=np.array([a.quit_step for a in ARCHETYPES], dtype=np.float64),
+            quit_recovery=np.array([a.quit_recovery for a in ARCHETYPES], dtype=np.float64),
+            queue_priority=np.array([a.queue_priority for a in ARCHETYPES], dtype=np.int64),
+            patience_mean=np.array([a.patience_mean for a in ARCHETYPES], dtype=np.float64),
+        )
+    return _table
+
+
+def type_sampler():
+    """Alias table over the archetype spawn weights."""
+    global _alias
+    if _alias is None:
+        _alias = AliasTable([a.spawn_weight for a in ARCHETYPES])
+    return _alias
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(1) draws from a discrete distribution, whatever its size."""
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        size = len(weights)
+        scaled = weights * size / weights.sum()
+        self.prob = np.ones(size, dtype=np.float64)
+        self.alias = np.arange(size, dtype=np.int64)
+
+        small = [i for i in range(size) if scaled[i] < 1.0]
+        large = [i for i in range(size) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self._prob = self.prob.tolist()
+        self._alias = self.alias.tolist()
+
+    def __len__(self):
+        return len(self._prob)
+
+    def draw(self, rng):
+        """One type code from the numpy.random.Generator `rng`."""
+        u = rng.random() * len(self._prob)
+        column = int(u)
+        return column if u - column < self._prob[column] else self._alias[column]
+
+    def sample(self, size, rng):
+        """`size` type codes in two bulk draws from `rng`."""
+        column = rng.integers(0, len(self._prob), size=size)
+        accept = rng.random(size) < self.prob[column]
+        return np.where(accept, column, self.alias[column]).astype(np.int8)
+
+
+register_archetype(Archetype("idler", 0.3, 10, 10, (1, 2), (1, 2), 0.01, 0.02, 2, 5.0))     # Easy Gamer
+register_archetype(Archetype("casual", 0.5, 55, 25, (1, 2), (1, 2), 0.01, 0.02, 1, 10.0))   # Casual Gamer
+register_archetype(Archetype("pro", 0.2, 240, 30, (1, 2), (1, 2), 0.01, 0.02, 0, 30.0))     # Pro Gamer
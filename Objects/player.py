@@ -1,53 +1,73 @@
-import random
 import numpy as np
+from Objects.archetypes import ARCHETYPES, PLAYER_TYPES, TYPE_CODES
+
+# Process-wide Generator of the calls that pass no rng, as the random module used to be
+_default_rng = np.random.default_rng()
 
 class Player:
-    def __init__(self, player_type):
-        self.type = player_type
+    __slots__ = ("type_code", "archetype", "session_duration", "happiness", "quit_rate", "rage_quit")
+
+    def __init__(self, player_type, rng=None):
+        self.reset(player_type, rng)
+
+    def reset(self, player_type, rng=None):
+        """(Re)initialises this record as a freshly joined player, so pooled records can be reused."""
+        if rng is None:
+            rng = _default_rng
+        code = TYPE_CODES.get(player_type)
+        if code is None:
+            raise ValueError("Unknown player type")
+        archetype = ARCHETYPES[code]
+        self.type_code = code
+        self.archetype = archetype
         self.happiness = 100
         self.quit_rate = 0
         self.rage_quit = False
-        
-        match player_type:
-            case "idler": self.session_duration = max(1, int(random.gauss(10, 10))) # Easy Gamer
-            case "casual": self.session_duration = max(1, int(random.gauss(55, 25))) # Casual Gamer
-            case "pro": self.session_duration = max(1, int(random.gauss(240, 30))) # Pro Gamer
-            case _: raise ValueError("Unknown player type")
-        
-    def tick(self, is_server_full, current_server_latency):
+        self.session_duration = max(1, int(rng.normal(archetype.session_mean, archetype.session_stddev)))
+
+    @property
+    def type(self):
+        return PLAYER_TYPES[self.type_code]
+
+    def tick(self, is_server_full, current_server_latency, rng=None):
         """Reduces the player's session by 1."""
+        if rng is None:
+            rng = _default_rng
         if self.session_duration > 0:
             self.session_duration -= 1
-        
+
         """Controls player happiness score according to server capacity"""
+        archetype = self.archetype
         if is_server_full and self.happiness > 0:
-            self.happiness -= random.randint(1, 2)
+            low, high = archetype.happiness_loss
+            self.happiness -= low + int(rng.random() * (high - low + 1))
             if self.happiness < 0:
                 self.happiness = 0
         elif not is_server_full and self.happiness < 100:
-            self.happiness += random.randint(1, 2)
+            low, high = archetype.happiness_gain
+            self.happiness += low + int(rng.random() * (high - low + 1))
             if self.happiness > 100:
                 self.happiness = 100
-            
+
         """Controls player happiness score according to server capacity"""
         if current_server_latency >= 100 and is_server_full:
-            self.quit_rate += 0.01
-            if random.random() < self.quit_rate:
+            self.quit_rate += archetype.quit_step
+            if rng.random() < self.quit_rate:
                 self.rage_quit = True
                 self.session_duration = 0  # Simulate rage quit
                 # print(f"I QUIT: {self.quit_rate} | {self.happiness}")
                 self.happiness = 0
         else:
             if self.quit_rate > 0.00:
-                self.quit_rate -= 0.02
+                self.quit_rate -= archetype.quit_recovery
 
     def is_rage_quit(self):
-        return self.rage_quit       
-    
+        return self.rage_quit
+
     def is_active(self):
         """Check if the player is still active."""
         return self.session_duration > 0
-    
+
     def get_happiness(self):
         return self.happiness
 
@@ -0,0 +1,46 @@
+from Objects.player import Player
+
+
+class PlayerPool:
+    """Fixed set of Player records where the first `size` entries are the live players.
+
+    Departed players are retired by swapping them with the last live player
+    (swap-remove), and their records are reset and reused by later spawns,
+    so the per-minute loop never rebuilds a list or allocates a new Player
+    once the pool has reached its peak size.
+    """
+
+    __slots__ = ("players", "size")
+
+    def __init__(self):
+        self.players = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        players = self.players
+        for index in range(self.size):
+            yield players[index]
+
+    def spawn(self, player_type, rng):
+        """Adds a player, reusing a retired record when one is available."""
+        if self.size < len(self.players):
+            player = self.players[self.size]
+            player.reset(player_type, rng)
+        else:
+            player = Player(player_type, rng)
+            self.players.append(player)
+        self.size += 1
+        return player
+
+    def retire(self, index):
+        """Swap-removes the live player at `index`; the last live player takes its slot."""
+        players = self.players
+        last = self.size - 1
+        player = players[index]
+        players[index] = players[last]
+        players[last] = player
+        self.size = last
+        return player
@@ -0,0 +1,418 @@
+# __main__.py
+"""Command line entry point: python -m Runner run --backend processes --runs 1000 --workers 8
+
+python -m Runner bench ... to time sweeps and fit scaling models (Runner/benchmark.py)
+python -m Runner query DB ... to look up days stored by run --warehouse DB,
+python -m Runner analyze DIR to re-analyze a sweep recorded with run --record DIR,
+python -m Runner plan ... to search the smallest capacity meeting a target (Runner/capacity.py),
+python -m Runner queue ... to compare open admission with a login queue (Runner/admission.py),
+python -m Runner autoscale ... to replay the same days under autoscaling policies (Runner/autoscale.py)
+and python -m Runner cluster ... to compare load balancer policies over many servers (Runner/cluster.py)."""
+import argparse
+from Engine.sampling import SAMPLING_MODES
+from Runner.parameters import ADMISSION_ENGINES, BACKEND_NAMES, ENGINE_NAMES, PLOT_VIEWS, Parameters
+
+
+def parse_precision(items):
+    """["pass_rate=0.02", "avg_happiness=0.5"] -> {"pass_rate": 0.02, "avg_happiness": 0.5}"""
+    precision = {}
+    for item in items:
+        name, _, target = item.partition("=")
+        if not target:
+            raise argparse.ArgumentTypeError(f"Expected metric=half_width, got {item!r}")
+        precision[name] = float(target)
+    return precision
+
+
+def build_parser():
+    defaults = Parameters()
+    parser = argparse.ArgumentParser(prog="python -m Runner", description="Monte Carlo game server simulation")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate a sweep of game days")
+    run.add_argument("--backend", choices=sorted(BACKEND_NAMES), default="processes")
+    run.add_argument("--engine", choices=sorted(ENGINE_NAMES), default=defaults.engine,
+                     help="per-day engine (ignored by the vectorized backend)")
+    run.add_argument("--runs", type=int, default=defaults.runs)
+    run.add_argument("--workers", type=int, default=None, help="default: every CPU this process may use")
+    run.add_argument("--chunksize", type=int, default=None,
+                     help="pool chunk size (processes) or days per batch (vectorized)")
+    run.add_argument("--seed", type=int, default=defaults.seed)
+    run.add_argument("--servers", type=int, default=defaults.servers)
+    run.add_argument("--min-capacity", type=int, default=defaults.minimum_capacity)
+    run.add_argument("--max-capacity", type=int, default=defaults.maximum_capacity)
+    run.add_argument("--sampling", choices=SAMPLING_MODES, default=defaults.sampling_mode)
+    run.add_argument("--replicates", type=int, default=defaults.replicates)
+    run.add_argument("--precision", nargs="+", default=None, metavar="METRIC=HALF_WIDTH",
+                     help="stop adaptively once every metric is this precise (--runs becomes the cap; not with --sampling crn)")
+    run.add_argument("--time-budget", type=float, default=None, help="seconds, with --precision")
+    run.add_argument("--batch-size", type=int, default=100, help="days per adaptive batch or warehouse commit")
+    run.add_argument("--plot", default=None, metavar="DIR", help="save the summary figures as PNGs in DIR")
+    run.add_argument("--plot-view", choices=PLOT_VIEWS, default="auto",
+                     help="per-run lines, percentile fan or 2D histogram (auto: lines up to 1000 runs)")
+    run.add_argument("--profile-dir", default=None, metavar="DIR",
+                     help="instrument every day; workers write their records to DIR (Engine/instrumentation.py)")
+    run.add_argument("--no-phases", action="store_true", help="skip per-minute phase timings")
+    run.add_argument("--cprofile", action="store_true", help="cProfile every worker, merged into one report")
+    run.add_argument("--tracemalloc", action="store_true", help="trace memory allocations in every worker")
+    run.add_argument("--record", default=None, metavar="DIR",
+                     help="write every run, minute by minute, to memory-mapped files in DIR (Engine/trace_store.py)")
+    run.add_argument("--cache", default=None, metavar="DIR",
+                     help="memoize simulated days in DIR, shared by later runs (Engine/day_cache.py)")
+    run.add_argument("--cache-mb", type=float, default=1024, help="byte budget of the --cache directory in MiB")
+    run.add_argument("--warehouse", default=None, metavar="DB",
+                     help="commit every --batch-size days to this SQLite file and resume from it (Runner/warehouse.py)")
+
+    query = commands.add_parser("query", help="look up stored days in a warehouse without re-simulating")
+    query.add_argument("database")
+    query.add_argument("--capacity", nargs=2, type=float, default=None, metavar=("LOW", "HIGH"))
+    query.add_argument("--servers", type=int, default=None)
+    query.add_argument("--scenario", type=int, default=None)
+    query.add_argument("--seed", type=int, default=None)
+
+    analyze = commands.add_parser("analyze", help="report (and plot) a sweep recorded with run --record")
+    analyze.add_argument("directory")
+    analyze.add_argument("--plot", default=None, metavar="DIR", help="save the summary figures as PNGs in DIR")
+    analyze.add_argument("--plot-view", choices=PLOT_VIEWS, default="auto",
+                     help="per-run lines, percentile fan or 2D histogram (auto: lines up to 1000 runs)")
+
+    bench = commands.add_parser("bench", help="time sweeps over backends, engines, workers, SERVERS and runs")
+    bench.add_argument("--backends", nargs="+", choices=sorted(BACKEND_NAMES), default=["processes"])
+    bench.add_argument("--engines", nargs="+", choices=sorted(ENGINE_NAMES), default=[defaults.engine])
+    bench.add_argument("--workers", nargs="+", type=int, default=None,
+                       help="default: 1, 2, 4, ... up to every CPU this process may use")
+    bench.add_argument("--servers", nargs="+", type=int, default=[defaults.servers])
+    bench.add_argument("--runs", nargs="+", type=int, default=[100])
+    bench.add_argument("--weak", action="store_true", help="also run weak scaling cases (runs x workers)")
+    bench.add_argument("--seed", type=int, default=defaults.seed)
+    bench.add_argument("--warmup", type=int, default=1)
+    bench.add_argument("--repetitions", type=int, default=3)
+    bench.add_argument("--output", default="benchmark.json", help="where to write the JSON report")
+    bench.add_argument("--baseline", default=None, help="earlier JSON report to compare against")
+    bench.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown vs. the baseline")
+    bench.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+
+    plan = commands.add_parser("plan", help="search the smallest server capacity that meets a success target")
+    plan.add_argument("--backend", choices=sorted(BACKEND_NAMES), default="processes")
+    plan.add_argument("--engine", choices=sorted(ENGINE_NAMES), default=None,
+                      help=f"per-day engine (default {defaults.engine}; not with the vectorized backend)")
+    plan.add_argument("--workers", type=int, default=None)
+    plan.add_argument("--criterion", choices=("pass", "overload"), default="pass",
+                      help="pass: average happiness >= 75; overload: few latency samples >= 100ms")
+    plan.add_argument("--max-overload", type=float, default=10.0, help="%% of overloaded samples a day may have")
+    plan.add_argument("--target", type=float, default=0.9, help="share of days that must succeed")
+    plan.add_argument("--confidence", type=float, default=0.95)
+    plan.add_argument("--resolution", type=int, default=5, help="capacity step the search stops at")
+    plan.add_argument("--batch-size", type=int, default=20, help="days added per test step")
+    plan.add_argument("--probe-days", type=int, default=100, help="day cap of every bisection probe")
+    plan.add_argument("--verify-days", type=int, default=1000, help="day cap of the final verification")
+    plan.add_argument("--seed", type=int, default=defaults.seed)
+    plan.add_argument("--servers", type=int, default=defaults.servers)
+    plan.add_argument("--min-capacity", type=int, default=defaults.minimum_capacity)
+    plan.add_argument("--max-capacity", type=int, default=600, help="upper end of the search (must meet the target)")
+
+    cluster = commands.add_parser("cluster", help="compare load balancer routing policies on a multi-server cluster")
+    cluster.add_argument("--servers", type=int, default=20, help="servers in the cluster")
+    cluster.add_argument("--policies", nargs="+", choices=("random", "round-robin", "least-loaded", "power-of-two"),
+                         default=None, help="default: every policy")
+    cluster.add_argument("--migrate", choices=("no", "yes", "both"), default="both",
+                         help="move players off full servers")
+    cluster.add_argument("--days", type=int, default=10)
+    cluster.add_argument("--arrival-scale", type=float, default=None,
+                         help="cluster demand in single-server days (default: --servers)")
+    cluster.add_argument("--min-capacity", type=int, default=defaults.minimum_capacity)
+    cluster.add_argument("--max-capacity", type=int, default=defaults.maximum_capacity)
+    cluster.add_argument("--workers", type=int, default=None)
+    cluster.add_argument("--seed", type=int, default=defaults.seed)
+
+    queue = commands.add_parser("queue", help="compare open admission with a login queue at one capacity")
+    queue.add_argument("--capacity", type=int, default=200)
+    queue.add_argument("--days", type=int, default=50)
+    queue.add_argument("--engine", choices=ADMISSION_ENGINES, default="arrays")
+    queue.add_argument("--workers", type=int, default=None)
+    queue.add_argument("--seed", type=int, default=defaults.seed)
+    queue.add_argument("--servers", type=int, default=defaults.servers)
+
+    autoscale = commands.add_parser("autoscale", help="replay the same days under fixed and autoscaling capacities")
+    autoscale.add_argument("--days", type=int, default=100)
+    autoscale.add_argument("--fixed", nargs="*", type=int, default=[200, 300], help="fixed capacities to compare")
+    autoscale.add_argument("--threshold", nargs="*", type=int, default=[150],
+                           help="initial capacities of threshold scalers")
+    autoscale.add_argument("--high", type=float, default=0.8, help="utilization that triggers a scale up")
+    autoscale.add_argument("--low", type=float, default=0.4, help="utilization that triggers a scale down")
+    autoscale.add_argument("--intervals", type=int, default=2, help="check intervals above --high before scaling up")
+    autoscale.add_argument("--cooldown", type=int, default=6, help="check intervals below --low before scaling down")
+    autoscale.add_argument("--step", type=int, default=50, help="capacity added or removed per decision")
+    autoscale.add_argument("--min-capacity", type=int, default=50)
+    autoscale.add_argument("--max-capacity", type=int, default=600)
+    autoscale.add_argument("--server-size", type=int, default=100, help="players per server for the server-minutes cost")
+    autoscale.add_argument("--batch-days", type=int, default=20, help="days replayed per lockstep pass")
+    autoscale.add_argument("--seed", type=int, default=defaults.seed)
+    autoscale.add_argument("--servers", type=int, default=defaults.servers)
+    autoscale.add_argument("--output", default=None, help="CSV file for the full policies x days table")
+    return parser
+
+
+def autoscale(args):
+    from Engine.autoscaling import FixedCapacity, ThresholdScaler
+    from Runner.metrics import PASSABLE_HAPPINESS
+    from Runner.autoscale import evaluate_policies, save_table
+
+    policies = [FixedCapacity(capacity) for capacity in args.fixed] + [
+        ThresholdScaler(initial, args.high, args.low, args.intervals, args.cooldown, args.step,
+                        args.min_capacity, args.max_capacity)
+        for initial in args.threshold
+    ]
+    if not policies:
+        raise SystemExit("Nothing to compare: give --fixed and/or --threshold capacities")
+    params = Parameters(runs=args.days, servers=args.servers, seed=args.seed)
+    table = evaluate_policies(params, policies, batch_days=args.batch_days, server_size=args.server_size)
+
+    print(f"[Autoscale] {args.days} days replayed under {len(policies)} policies")
+    print(f"{'policy':<32}{'happiness':>11}{'pass':>7}{'dropouts':>10}{'server-min':>12}{'peak cap':>10}")
+    for index, name in enumerate(table.names):
+        happiness = table.avg_happiness[index]
+        print(f"{name:<32}{happiness.mean():>11.1f}{(happiness >= PASSABLE_HAPPINESS).mean():>7.0%}"
+              f"{table.dropouts[index].mean():>10.0f}{table.server_minutes[index].mean():>12.0f}"
+              f"{table.capacity_log[index].max(axis=1).mean():>10.0f}")
+    if args.output:
+        save_table(table, args.output)
+        print(f"Saved {args.output}")
+    return 0
+
+
+def queue(args):
+    import numpy as np
+    from Runner.admission import compare_admission
+    from Runner.metrics import PASSABLE_HAPPINESS
+
+    params = Parameters(runs=args.days, servers=args.servers, seed=args.seed, engine=args.engine)
+    result = compare_admission(params, args.capacity, workers=args.workers)
+    print(f"[Queue] capacity {result.capacity}, {result.days} days with the {args.engine} engine")
+    for label, happiness, disconnections in (
+        ("open", result.open_happiness, result.open_disconnections),
+        ("queued", result.queued_happiness, result.queued_disconnections),
+    ):
+        print(f"{label:<8} avg happiness {happiness.mean():6.1f}, pass {(happiness >= PASSABLE_HAPPINESS).mean():4.0%}, "
+              f"{disconnections.mean():.0f} rage quits per day")
+
+    summary = result.summary
+    print(f"Queued players: {summary['admitted'] / result.days:.0f} admitted, {summary['abandoned'] / result.days:.0f} "
+          f"abandoned ({summary['abandonment_rate']:.1%}), {summary['unserved'] / result.days:.1f} unserved per day; "
+          f"abandoned by type over all days {summary['abandoned_by_type']}")
+    print("Wait (min):   mean {:.1f}, ".format(summary["mean_wait"])
+          + ", ".join(f"p{p} {value:.0f}" for p, value in summary["wait_percentiles"].items()))
+    print("Queue length: " + ", ".join(f"p{p} {value:.0f}" for p, value in summary["length_percentiles"].items())
+          + f", max {summary['max_length']}")
+
+    # Hourly means over every day; waits only count intervals that admitted someone
+    samples_per_hour = max(result.length_log.shape[1] // 24, 1)
+    print(f"{'hour':>4}{'queue':>8}{'wait':>8}")
+    for start in range(0, result.length_log.shape[1], samples_per_hour):
+        hour = slice(start, start + samples_per_hour)
+        waits = result.wait_log[:, hour]
+        waits = waits[~np.isnan(waits)]
+        wait = f"{waits.mean():8.1f}" if len(waits) else f"{'-':>8}"
+        print(f"{start // samples_per_hour:>4}{result.length_log[:, hour].mean():8.1f}{wait}")
+    return 0
+
+
+def cluster(args):
+    from Runner.cluster import cluster_capacities, compare_policies
+
+    capacities = cluster_capacities(args.seed, args.servers, args.min_capacity, args.max_capacity)
+    migrate = {"no": (False,), "yes": (True,), "both": (False, True)}[args.migrate]
+    results = compare_policies(
+        capacities, args.days, args.policies, migrate, args.arrival_scale, seed=args.seed, workers=args.workers
+    )
+    print(f"[Cluster] {args.servers} servers, capacity {capacities.min():.0f}-{capacities.max():.0f} "
+          f"(total {capacities.sum():.0f}), {args.days} days per policy")
+    print(f"{'policy':<14}{'migrate':>8}{'happiness':>11}{'pass':>7}{'overload%':>11}{'full%':>8}"
+          f"{'imbalance':>11}{'dropouts':>10}{'migrations':>12}")
+    for result in results:
+        print(f"{result.policy:<14}{'yes' if result.migrate else 'no':>8}{result.avg_happiness:>11.1f}"
+              f"{result.pass_rate:>7.0%}{result.overload_pct:>11.2f}{result.full_pct:>8.2f}{result.imbalance:>11.2f}"
+              f"{result.dropouts:>10.0f}{result.migrations:>12.0f}")
+    return 0
+
+
+def plan(args):
+    from Runner.capacity import plan_capacity
+
+    if args.engine is not None and args.backend == "vectorized":
+        raise SystemExit("The vectorized backend runs its own lockstep engine: drop --engine or pick a per-day backend")
+    params = Parameters(
+        servers=args.servers,
+        minimum_capacity=args.min_capacity,
+        maximum_capacity=args.max_capacity,
+        seed=args.seed,
+    )
+    if args.engine is not None:
+        params = params._replace(engine=args.engine)
+    search = plan_capacity(
+        params, args.backend, args.workers, args.criterion, args.max_overload, args.target,
+        args.confidence, args.resolution, args.batch_size, args.probe_days, args.verify_days,
+    )
+    for probe in search.probes:
+        verdict = "meets" if probe.meets else "fails"
+        print(f"[Plan] capacity {probe.capacity}: {probe.successes}/{probe.days} days ok -> {verdict}"
+              f"{'' if probe.decided else ' (undecided, point estimate)'}")
+    status = "verified" if search.verified else "NOT verified"
+    print(f"🧠 Smallest capacity with >= {args.target:.0%} successful days: {search.capacity} ({status}, "
+          f"success rate {search.success_rate:.3f}, {args.confidence:.0%} lower bound {search.lower_bound:.3f})")
+    print(f"Simulated {search.days} days")
+    return 0
+
+
+def default_worker_counts():
+    from Engine.scheduler import available_workers
+    limit = available_workers()
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def bench(args):
+    from Runner import benchmark
+
+    cases = benchmark.bench_cases(
+        args.backends, args.engines, args.workers or default_worker_counts(), args.servers, args.runs, args.weak
+    )
+    report = benchmark.run_benchmarks(cases, args.seed, args.warmup, args.repetitions)
+    benchmark.save_report(report, args.output)
+    print(f"Saved {args.output}\n")
+    print(benchmark.notes_table(report))
+
+    for model in report["models"]:
+        fit = (f"Amdahl P = {model['amdahl_p']:.4f}" if model["scaling"] == "strong"
+               else f"Gustafson alpha = {model['gustafson_alpha']:.4f}")
+        print(f"[Scaling] {model['backend']}/{model['engine']} servers={model['servers']} runs={model['runs']} "
+              f"({model['scaling']}): T1 = {model['baseline_wall']:.2f}s, {fit}")
+
+    regressions = 0
+    if args.baseline:
+        for case, ratio, verdict in benchmark.compare(report, benchmark.load_report(args.baseline), args.tolerance):
+            regressions += verdict == "regression"
+            print(f"[Baseline] {case.backend}/{case.engine} workers={case.workers} servers={case.servers} "
+                  f"runs={case.runs} ({case.scaling}): x{ratio:.2f} {verdict}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "bench":
+        return bench(args)
+    if args.command == "plan":
+        return plan(args)
+    if args.command == "cluster":
+        return cluster(args)
+    if args.command == "queue":
+        return queue(args)
+    if args.command == "autoscale":
+        return autoscale(args)
+    if args.command == "analyze":
+        return analyze(args)
+    if args.command == "query":
+        return query(args)
+
+    params = Parameters(
+        runs=args.runs,
+        servers=args.servers,
+        minimum_capacity=args.min_capacity,
+        maximum_capacity=args.max_capacity,
+        seed=args.seed,
+        sampling_mode=args.sampling,
+        replicates=args.replicates,
+        engine=args.engine,
+    )
+
+    # Imported here so --help stays fast
+    from Runner.sweep import run_sweep
+    from Runner.analysis import report
+    from Engine.instrumentation import Instrumentation, print_report
+    from Engine.day_cache import CacheConfig, disk_usage
+
+    instrumentation = None
+    if args.profile_dir:
+        instrumentation = Instrumentation(
+            args.profile_dir, phases=not args.no_phases, cprofile=args.cprofile, tracemalloc=args.tracemalloc
+        )
+
+    sweep = run_sweep(
+        params,
+        backend=args.backend,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        precision=parse_precision(args.precision) if args.precision else None,
+        time_budget=args.time_budget,
+        batch_size=args.batch_size,
+        instrumentation=instrumentation,
+        record=args.record,
+        warehouse=args.warehouse,
+        cache=CacheConfig(args.cache, disk_bytes=int(args.cache_mb * 2 ** 20)) if args.cache else None,
+    )
+    report(sweep)
+    if sweep.instrumentation is not None:
+        print()
+        print_report(sweep.instrumentation)
+    if args.cache:
+        size, files = disk_usage(args.cache)
+        print(f"[Cache] {args.cache}: {files} days, {size / 2 ** 20:.1f} MiB")
+    if args.record:
+        print(f"Recorded {sweep.runs} runs in {args.record}")
+    if args.plot:
+        save_plots(sweep, args.plot, args.plot_view)
+
+
+def save_plots(sweep, directory, view):
+    import time
+    from Runner.analysis import save_plots as render
+
+    start = time.perf_counter()
+    paths = render(sweep, directory, view)
+    print(f"Saved {', '.join(paths)} in {time.perf_counter() - start:.2f}s")
+
+
+def query(args):
+    import time
+    from Runner.metrics import PASSABLE_HAPPINESS
+    from Runner.warehouse import Warehouse
+
+    with Warehouse(args.database) as warehouse:
+        if args.capacity is None and args.servers is None and args.scenario is None and args.seed is None:
+            for scenario, params, days in warehouse.scenarios():
+                print(f"[Scenario {scenario}] {days}/{params['runs']} days, servers={params['servers']}, "
+                      f"capacity {params['minimum_capacity']}-{params['maximum_capacity']}, seed={params['seed']}, "
+                      f"{params['sampling_mode']}, {params['engine']}")
+            return 0
+        start = time.perf_counter()
+        days = warehouse.query(args.capacity, args.servers, args.scenario, args.seed)
+        elapsed = time.perf_counter() - start
+
+    count = len(days["run_index"])
+    print(f"[Query] {count} days in {1000 * elapsed:.1f}ms")
+    if count:
+        happiness = days["avg_happiness"]
+        print(f"avg happiness {happiness.mean():.2f}, pass {(happiness >= PASSABLE_HAPPINESS).mean():.1%}, "
+              f"{days['disconnections'].mean():.0f} rage quits per day, "
+              f"capacity {days['capacity'].min():.0f}-{days['capacity'].max():.0f}, "
+              f"scenarios {sorted(set(days['scenario'].tolist()))}")
+    return 0
+
+
+def analyze(args):
+    from Runner.sweep import load_sweep
+    from Runner.analysis import report
+
+    sweep = load_sweep(args.directory)
+    report(sweep)
+    if args.plot:
+        save_plots(sweep, args.plot, args.plot_view)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+# admission.py
+from collections import namedtuple
+import numpy as np
+from Engine.login_queue import LoginQueue, queue_summary
+from Engine.scheduler import session_scheduler
+from Engine.seeding import run_rng
+from Runner.backends import ENGINES
+from Runner.parameters import ADMISSION_ENGINES, validate
+
+# Days simulated with and without a login queue, on the same streams
+#   open            (days,) avg_happiness and (days,) disconnections when every arrival joins
+#   queued          the same with admission control
+#   summary         queue_summary of every day's LoginQueue
+#   length_log      (days, samples) players waiting at every check_interval
+#   wait_log        (days, samples) mean wait of the players admitted in every interval
+AdmissionResult = namedtuple("AdmissionResult", [
+    "capacity", "days", "open_happiness", "open_disconnections", "queued_happiness", "queued_disconnections",
+    "summary", "length_log", "wait_log",
+])
+
+
+def admission_task(task):
+    """Process pool task: one day at `capacity`, with a LoginQueue when `queued`."""
+    params, capacity, day, queued = task
+    queue = LoginQueue() if queued else None
+    args = (params.workday_minutes, params.check_interval, capacity, params.servers)
+    result = ENGINES[params.engine](*args, rng=run_rng(params.seed, day), admission=queue)
+    return result[1], result[7], queue
+
+
+def compare_admission(params, capacity, days=None, workers=None):
+    """Simulates `days` (default params.runs) days at `capacity` with open admission and with a login queue."""
+    validate(params)
+    if params.engine not in ADMISSION_ENGINES:
+        raise ValueError(f"The {params.engine} engine has no admission control")
+    days = params.runs if days is None else days
+    tasks = [(params, capacity, day, queued) for queued in (False, True) for day in range(days)]
+
+    scheduler = session_scheduler(workers)
+    try:
+        results = scheduler.run(admission_task, tasks, label="Simulating")
+    except BaseException:
+        scheduler.terminate()  # the session's pool stays warm only when the comparison finished
+        raise
+
+    happiness = np.array([result[0] for result in results]).reshape(2, days)
+    disconnections = np.array([result[1] for result in results]).reshape(2, days)
+    queues = [result[2] for result in results[days:]]
+    return AdmissionResult(
+        capacity, days, happiness[0], disconnections[0], happiness[1], disconnections[1],
+        queue_summary(queues),
+        np.array([queue.length_log for queue in queues]),
+        np.array([queue.wait_log for queue in queues]),
+    )
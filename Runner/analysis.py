@@ -0,0 +1,223 @@
+# analysis.py
+import os
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from Engine.sampling import variance_reduction_factor
+from Objects.archetypes import PLAYER_TYPES
+from Runner.metrics import (
+    OVERLOAD_LATENCY, PASSABLE_HAPPINESS, capacity_bins, dropouts_by_type, latency_stats, overload_capacity,
+    sweep_columns,
+)
+from Runner.parameters import PLOT_VIEWS
+
+# How plot_sweep draws per-run data, by PLOT_VIEWS name (Runner/parameters.py)
+#   lines    one LineCollection per daily series, one scatter call per point series
+#   fan      5-25-50-75-95 percentile bands of the daily series, 2D histograms / capacity bins for the rest
+#   density  2D histograms of the daily series (value x time of day) and of the point series
+#   auto     lines up to LINE_LIMIT runs, fan beyond, so large sweeps render in constant time
+LINE_LIMIT = 1000
+
+
+def report(sweep):
+    """Prints the timing, pass rate, overload point and variance reduction of a sweep."""
+    params = sweep.params
+    columns = sweep_columns(sweep)
+    avg_happiness = columns.avg_happiness
+    engine = "batched" if sweep.backend == "vectorized" else params.engine
+    print(f"[{sweep.backend}] {sweep.runs} days with the {engine} engine in {sweep.elapsed:.2f}s "
+          f"({sweep.runs / sweep.elapsed:.1f} days/s)")
+
+    if sweep.adaptive is not None:
+        print(f"[Adaptive] Stopped by {sweep.adaptive.stopped_by} after {sweep.adaptive.runs} runs")
+        for name, (mean, half_width) in sweep.adaptive.estimates.items():
+            print(f"[Adaptive] {name}: {mean:.3f} ± {half_width:.3f}")
+
+    passed = int((avg_happiness >= PASSABLE_HAPPINESS).sum())
+    print(f"✅ Pass: {passed}/{sweep.runs} ({100 * passed / sweep.runs:.1f}%)")
+
+    # Analyze spike in latency: biggest jump in mean latency between neighbouring capacities
+    mean_latency, overload_pct = latency_stats(columns.latency)
+    spike = overload_capacity(columns.capacity, mean_latency)
+    if spike is not None:
+        print(f"🧠 Estimated overload point: Server capacity ≈ {spike}")
+    print(f"🔥 Overload: {overload_pct.mean():.1f}% of samples at or above {OVERLOAD_LATENCY:.0f}ms, "
+          f"mean latency {mean_latency.mean():.1f}ms")
+    dropouts = dropouts_by_type(columns.dropouts)
+    print("🚪 Dropouts per day: " + ", ".join(f"{t} {total / sweep.runs:.2f}" for t, total in dropouts.items()))
+
+    # Achieved variance reduction of the sampling mode, measured across replicate groups
+    vrf_happiness = variance_reduction_factor(avg_happiness, sweep.groups)
+    vrf_pass = variance_reduction_factor(avg_happiness >= PASSABLE_HAPPINESS, sweep.groups)
+    print(f"📉 Variance reduction ({params.sampling_mode}): avg_happiness x{vrf_happiness:.2f}, pass rate x{vrf_pass:.2f}")
+
+
+def daily_series(ax, minutes, series, color, cmap, label, view):
+    """One daily series of every run (runs, samples) on `ax`, in a constant number of artists."""
+    if view == "lines":
+        segments = np.empty(series.shape + (2,))
+        segments[:, :, 0] = minutes
+        segments[:, :, 1] = series
+        ax.add_collection(LineCollection(segments, colors=color, alpha=0.5, label=label))  # Light opacity for visibility
+        ax.autoscale_view()
+    elif view == "fan":
+        low, q1, median, q3, high = np.percentile(series, [5, 25, 50, 75, 95], axis=0)
+        ax.fill_between(minutes, low, high, color=color, alpha=0.15, label=f"{label} (5-95%)")
+        ax.fill_between(minutes, q1, q3, color=color, alpha=0.3, label=f"{label} (25-75%)")
+        ax.plot(minutes, median, color=color, label=f"{label} (median)")
+    else:
+        value_edges = np.linspace(series.min(), series.max() + 1e-9, 61)
+        time_edges = np.append(minutes, minutes[-1] + 1) - 0.5
+        counts, _, _ = np.histogram2d(
+            np.broadcast_to(minutes, series.shape).ravel(), np.asarray(series).ravel(), bins=(time_edges, value_edges)
+        )
+        ax.pcolormesh(time_edges, value_edges, np.ma.masked_equal(counts.T, 0), cmap=cmap, norm="log", alpha=0.8)
+        ax.plot([], [], color=color, label=f"{label} (runs per cell)")
+
+
+def point_density(ax, x, y, bins=50):
+    """2D histogram of (x, y) pairs, drawn as one mesh."""
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+
+
+def plot_sweep(sweep, view="auto", headless=False):
+    """The two summary figures of a sweep: the 2 x 2 overview and overload / average dropouts.
+
+    Every panel uses a fixed number of artists whatever the number of runs
+    (see PLOT_VIEWS). With `headless` the figures are plain Figure objects,
+    rendered by Agg when saved and never registered with pyplot.
+    """
+    if view not in PLOT_VIEWS:
+        raise ValueError(f"Unknown plot view: {view}")
+    columns = sweep_columns(sweep)
+    capacities, avg_happiness, active_log, latency = (
+        columns.capacity, columns.avg_happiness, columns.active_log, columns.latency
+    )
+    runs = sweep.runs
+    if view == "auto":
+        view = "lines" if runs <= LINE_LIMIT else "fan"
+    happiness_by_type = sweep.table.happiness_by_type(runs)
+    types = list(PLAYER_TYPES)
+    colors = ['gray', 'orange', 'green']
+
+    samples = active_log.shape[1]
+    minutes = np.arange(samples)
+    samples_per_hour = samples // 24 or 1
+    hour_ticks = np.arange(0, samples, samples_per_hour)
+    hour_labels = [f"{h}" for h in range(len(hour_ticks))]
+
+    if headless:
+        fig = Figure(figsize=(19, 10))
+        axs = fig.subplots(2, 2)  # 2 rows x 2 cols
+    else:
+        import matplotlib.pyplot as plt
+        fig, axs = plt.subplots(2, 2, figsize=(19, 10))  # 2 rows x 2 cols
+
+    # Third figure: Line plot
+    daily_series(axs[1, 0], minutes, active_log, 'blue', 'Blues', 'Expected Spawn Rate', view)
+    daily_series(axs[1, 0], minutes, latency, 'red', 'Reds', 'Total Server Latency', view)
+    axs[1, 0].axvline(8 * samples_per_hour, color='red', linestyle='--', label='08:00')
+    axs[1, 0].axvline(12 * samples_per_hour, color='green', linestyle='--', label='12:00 (Peak)')
+    axs[1, 0].axvline(16 * samples_per_hour, color='red', linestyle='--', label='16:00')
+    axs[1, 0].set_title(f"{runs} Simulated Game Days - Player Spawn Rate Over a Day")
+    axs[1, 0].set_xticks(hour_ticks, hour_labels)
+    axs[1, 0].set_xlabel("Time (1-hour intervals)")
+    axs[1, 0].set_ylabel("Online Players log per interval")
+    axs[1, 0].grid(True)
+    axs[1, 0].legend()
+
+    # Fourth figure: Scatter plot
+    passed = avg_happiness >= PASSABLE_HAPPINESS
+    if view == "lines":
+        axs[1, 1].scatter(avg_happiness[passed], capacities[passed], color='green')
+        axs[1, 1].scatter(avg_happiness[~passed], capacities[~passed], color='red')
+    else:
+        fig.colorbar(point_density(axs[1, 1], avg_happiness, capacities), ax=axs[1, 1], label="Runs")
+    pass_count = int(passed.sum())
+    fail_count = runs - pass_count
+    axs[1, 1].scatter([], [], color='green', label=f'Pass: {pass_count} ({round(pass_count / runs * 100, 1)}%)')
+    axs[1, 1].scatter([], [], color='red', label=f'Fail: {fail_count} ({round(fail_count / runs * 100, 1)}%)')
+    axs[1, 1].axvline(PASSABLE_HAPPINESS, color='orange', linestyle='--', label='Passable Happiness')
+    axs[1, 1].axvline(100, color='red', linestyle='--', label='Max Happiness')
+    axs[1, 1].set_title(f"{runs} Simulated Game Days - Average Happiness vs. Server Max Capacity")
+    axs[1, 1].set_xlabel("Average Player Happiness")
+    axs[1, 1].set_ylabel("Server Max Capacity")
+    axs[1, 1].grid(True)
+    axs[1, 1].legend()
+
+    # First Figure: Bar Chart
+    totals = list(dropouts_by_type(columns.dropouts).values())
+    bars = axs[0, 0].bar(types, totals, color=colors)
+    for bar, t, v in zip(bars, types, totals): # Add legend with dropout count per type
+        bar.set_label(f"{t.capitalize()}: {v} dropped out")
+    axs[0, 0].legend()
+    axs[0, 0].set_title("Total Dropouts by Player Type")
+    axs[0, 0].set_ylabel("Dropout Count")
+    axs[0, 0].set_xlabel("Player Type")
+    axs[0, 0].grid(axis='y')
+
+    # Second Figure: Boxplot Chart
+    axs[0, 1].bxp([happiness_by_type[t].box_stats(t) for t in types], showfliers=False)
+    axs[0, 1].set_title("Final Happiness Distribution by Player Type")
+    axs[0, 1].set_ylabel("Happiness")
+    axs[0, 1].set_xlabel("Player Type")
+    axs[0, 1].grid(True)
+    for t in types: # Compute stats and build legend
+        summary = happiness_by_type[t]
+        axs[0, 1].scatter([], [], label=f"{t.capitalize()} - Mean: {round(summary.mean, 2)}, Median: {round(summary.median, 2)}")
+    axs[0, 1].legend()
+    fig.tight_layout()
+
+    # Server Capacity vs. % of Overloaded Runs, and Average Dropouts per Player Type Across All Runs
+    mean_latencies, overload_pct = latency_stats(latency)
+    averages = np.array(totals) / runs
+
+    if headless:
+        overload_fig = Figure(figsize=(16, 6))
+        axs = overload_fig.subplots(1, 2)
+    else:
+        overload_fig, axs = plt.subplots(1, 2, figsize=(16, 6))
+    if view == "lines":
+        axs[0].scatter(capacities, overload_pct, marker='o', color='crimson',
+                       label=f'Overload % (avg={overload_pct.mean():.2f}%)')
+        axs[0].scatter(capacities, mean_latencies, marker='x', color='gold',
+                       label=f'Mean Latency (avg={mean_latencies.mean():.2f}ms)')
+    else:
+        # Means per capacity bin instead of one marker per run
+        binned = capacity_bins(capacities, avg_happiness, mean_latencies, overload_pct)
+        centres = (binned.low + binned.high) / 2
+        axs[0].plot(centres, binned.overload_pct, marker='o', color='crimson',
+                    label=f'Overload % by capacity (avg={overload_pct.mean():.2f}%)')
+        axs[0].plot(centres, binned.mean_latency, marker='x', color='gold',
+                    label=f'Mean Latency by capacity (avg={mean_latencies.mean():.2f}ms)')
+    axs[0].set_xlabel("Server Max Capacity")
+    axs[0].set_ylabel("% of Runs with Overload (Latency > 100ms)")
+    axs[0].set_title("Server Capacity vs. % of Overloaded Runs")
+    axs[0].grid(True)
+    axs[0].set_ylim(0, 100)
+    axs[0].axhline(50, color='orange', linestyle='--', label='50% Threshold')
+    axs[0].legend()
+
+    bars = axs[1].bar(types, averages, color=colors)
+    axs[1].set_title("Average Dropouts per Player Type Across All Runs")
+    axs[1].set_xlabel("Player Type")
+    axs[1].set_ylabel("Average Dropouts")
+    axs[1].grid(axis='y')
+    for bar in bars: # Add value labels to bars
+        yval = bar.get_height()
+        axs[1].text(bar.get_x() + bar.get_width() / 2, yval + 0.05, f"{yval:.2f}", ha='center', va='bottom')
+    overload_fig.tight_layout()
+
+    return fig, overload_fig
+
+
+def save_plots(sweep, directory, view="auto", dpi=100):
+    """Renders both summary figures headless (Agg) to PNGs in `directory` and returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, fig in zip(("overview", "overload"), plot_sweep(sweep, view, headless=True)):
+        path = os.path.join(directory, f"{name}.png")
+        fig.savefig(path, dpi=dpi)
+        paths.append(path)
+    return paths
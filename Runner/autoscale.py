@@ -0,0 +1,44 @@
+# autoscale.py
+import csv
+import numpy as np
+from Engine.autoscaling import PolicyTable, replay_policies
+from Engine.batched_engine import sample_trace
+from Engine.scheduler import Progress
+from Engine.seeding import run_rng
+from Runner.parameters import validate
+
+
+def evaluate_policies(params, policies, days=None, batch_days=20, server_size=100):
+    """policies x days PolicyTable of params.runs (or `days`) days, each replayed under every policy.
+
+    Day i's trace is sampled once from stream i, whatever the batch it lands
+    in; batches of `batch_days` days (times len(policies) rows) bound memory.
+    """
+    validate(params)
+    days = params.runs if days is None else days
+    progress = Progress(days, "Replaying")
+    tables = []
+    for start in range(0, days, batch_days):
+        traces = [
+            sample_trace(params.workday_minutes, params.servers, run_rng(params.seed, day))
+            for day in range(start, min(start + batch_days, days))
+        ]
+        tables.append(replay_policies(traces, policies, params.workday_minutes, params.check_interval, server_size))
+        progress.update(len(traces))
+    return PolicyTable(
+        tables[0].names,
+        *(np.concatenate([getattr(table, field) for table in tables], axis=1) for field in PolicyTable._fields[1:])
+    )
+
+
+def save_table(table, path):
+    """One CSV row per (policy, day): avg_happiness, dropouts and server_minutes."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["policy", "day", "avg_happiness", "dropouts", "server_minutes"])
+        for index, name in enumerate(table.names):
+            for day in range(table.avg_happiness.shape[1]):
+                writer.writerow([
+                    name, day, f"{table.avg_happiness[index, day]:.4f}",
+                    int(table.dropouts[index, day]), f"{table.server_minutes[index, day]:.0f}",
+                ])
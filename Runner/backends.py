@@ -0,0 +1,179 @@
+# backends.py
+from concurrent.futures import ThreadPoolExecutor
+from Engine.batched_engine import sample_trace, simulate_game_days
+from Engine.day_cache import day_cache, day_key
+from Engine.event_engine import simulate_game_day_events
+from Engine.instrumentation import recorder
+from Engine.jit_engine import jit_kernels, simulate_game_day_jit
+from Engine.scheduler import Progress, available_workers, session_scheduler
+from Engine.seeding import run_rng
+from Engine.shared_results import attach
+from Engine.simulation_engine import simulate_game_day
+from Engine.vectorized_engine import simulate_game_day_vectorized
+
+# Per-day engines the sequential, threads and processes backends can run, keyed by Runner.parameters.ENGINE_NAMES
+# (the vectorized backend always advances whole batches of days with Engine/batched_engine.py)
+ENGINES = {
+    "reference": simulate_game_day,            # Player objects, one tick per minute
+    "arrays": simulate_game_day_vectorized,    # NumPy arrays, one tick per minute
+    "events": simulate_game_day_events,        # discrete events, skips quiet minutes
+    "jit": simulate_game_day_jit,              # arrays with numba tick / retire kernels (arrays without numba)
+}
+
+# Every backend fills rows start .. start + count - 1 of a SharedResults table
+# for the days of a plan (capacities, streams) and returns their run indices,
+# so the analysis stage never needs to know which backend produced a row.
+# close() ends a backend's use: close(error=True) when leaving on an exception
+# (Ctrl-C included) stops outstanding work instead of waiting for it.
+
+
+def simulate_run(params, capacity, stream, instrumentation=None, cache=None):
+    """One simulated day with the configured per-day engine, recorded when `instrumentation` is set.
+
+    With `cache` (an Engine.day_cache.CacheConfig) the day is looked up by its
+    content address first and stored after simulating it.
+    """
+    if cache is not None:
+        memo = day_cache(cache)
+        key = day_key(ENGINES[params.engine], params.workday_minutes, params.check_interval, capacity,
+                      params.servers, params.seed, stream)
+        result = memo.get(key)
+        if result is None:
+            result = simulate_run(params, capacity, stream, instrumentation)
+            memo.put(key, result)
+        return result
+    args = (params.workday_minutes, params.check_interval, capacity, params.servers)
+    rng = run_rng(params.seed, stream)
+    if instrumentation is None:
+        return ENGINES[params.engine](*args, rng=rng)
+    # Only the reference engine reports phase timings
+    return recorder(instrumentation).run(ENGINES[params.engine], *args, rng=rng, phases=params.engine == "reference")
+
+
+def simulate_task(task):
+    """Process pool task: simulate one day and write its row into the shared block in place."""
+    params, run_index, capacity, stream, spec, instrumentation, cache = task
+    attach(spec).write(run_index, simulate_run(params, capacity, stream, instrumentation, cache))
+    return run_index
+
+
+class SequentialBackend:
+    """Every day in this process, one after another."""
+
+    def __init__(self, params, workers=None, chunksize=None, instrumentation=None, cache=None):
+        self.params = params
+        self.instrumentation = instrumentation
+        self.cache = cache
+
+    def run(self, table, capacities, streams, start, count):
+        progress = Progress(count, "Simulating")
+        for run_index in range(start, start + count):
+            table.write(run_index, simulate_run(self.params, capacities[run_index], streams[run_index], self.instrumentation, self.cache))
+            progress.update()
+        return list(range(start, start + count))
+
+    def close(self, error=False):
+        pass
+
+
+class ThreadBackend:
+    """Days spread over a thread pool; each thread writes its own rows.
+
+    The engines are pure Python / small NumPy calls, so this mostly measures
+    how much the GIL serialises them.
+    """
+
+    def __init__(self, params, workers=None, chunksize=None, instrumentation=None, cache=None):
+        self.params = params
+        self.instrumentation = instrumentation
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=workers or available_workers())
+
+    def run(self, table, capacities, streams, start, count):
+        progress = Progress(count, "Simulating")
+
+        def simulate(run_index):
+            table.write(run_index, simulate_run(self.params, capacities[run_index], streams[run_index], self.instrumentation, self.cache))
+            return run_index
+
+        run_indices = []
+        for run_index in self.executor.map(simulate, range(start, start + count)):
+            run_indices.append(run_index)
+            progress.update()
+        return run_indices
+
+    def close(self, error=False):
+        self.executor.shutdown(cancel_futures=error)
+
+
+class ProcessBackend:
+    """Days spread over the session's warm process pool (Engine/scheduler.py), heaviest first, rows written in shared memory.
+
+    close() leaves the pool running for the next sweep of the session;
+    close(error=True) terminates it.
+    """
+
+    def __init__(self, params, workers=None, chunksize=None, instrumentation=None, cache=None):
+        self.params = params
+        self.instrumentation = instrumentation
+        self.cache = cache
+        if params.engine == "jit":
+            jit_kernels()  # compile once here, so workers inherit the kernels or load them from the disk cache
+        self.scheduler = session_scheduler(workers, chunksize)
+
+    def run(self, table, capacities, streams, start, count):
+        tasks = [
+            (self.params, run_index, capacities[run_index], streams[run_index], table.spec, self.instrumentation, self.cache)
+            for run_index in range(start, start + count)
+        ]
+        return self.scheduler.run(simulate_task, tasks, costs=capacities[start:start + count], label="Simulating")
+
+    def close(self, error=False):
+        if error:
+            self.scheduler.terminate()
+
+
+class VectorizedBackend:
+    """Whole batches of days advanced in lockstep by Engine/batched_engine.py.
+
+    Every day is traced from its own run_rng stream (Engine.batched_engine.sample_trace),
+    so it gets the same arrivals as on the per-day backends and the same
+    result whichever batch it lands in. Its players draw from a per player hash
+    instead of the day's Generator, so the days themselves differ from the
+    per-day engines' and it does not use their per-day cache.
+    """
+
+    def __init__(self, params, workers=None, chunksize=None, instrumentation=None, cache=None):
+        self.params = params
+        self.instrumentation = instrumentation
+        self.cache = cache
+        self.batch_days = chunksize
+
+    def run(self, table, capacities, streams, start, count):
+        params = self.params
+        batch_days = self.batch_days or count
+        progress = Progress(count, "Simulating")
+        for batch_start in range(start, start + count, batch_days):
+            rows = slice(batch_start, min(batch_start + batch_days, start + count))
+            args = (capacities[rows], params.workday_minutes, params.check_interval, params.servers)
+            traces = [sample_trace(params.workday_minutes, params.servers, run_rng(params.seed, stream)) for stream in streams[rows]]
+            kwargs = dict(traces=traces, happiness_counts=table.happiness[rows])
+            if self.instrumentation is None:
+                result = simulate_game_days(*args, **kwargs)
+            else:
+                result = recorder(self.instrumentation).run(simulate_game_days, *args, phases=False, **kwargs)
+            table.write_days(batch_start, result)
+            progress.update(rows.stop - rows.start)
+        return list(range(start, start + count))
+
+    def close(self, error=False):
+        pass
+
+
+# Keyed by Runner.parameters.BACKEND_NAMES
+BACKENDS = {
+    "sequential": SequentialBackend,
+    "threads": ThreadBackend,
+    "processes": ProcessBackend,
+    "vectorized": VectorizedBackend,
+}
@@ -0,0 +1,281 @@
+# benchmark.py
+import json
+import os
+import platform
+import statistics
+import time
+from collections import namedtuple, defaultdict
+import numpy as np
+from Engine.sampling import capacity_plan
+from Engine.shared_results import SharedResults
+from Runner.backends import BACKENDS
+from Runner.parameters import Parameters
+
+try:
+    import resource
+except ImportError:  # not available on Windows: CPU time falls back to os.times, no peak RSS
+    resource = None
+
+# One benchmarked configuration
+#   scaling  "strong": runs stay fixed as workers grow (Amdahl)
+#            "weak":   runs grow with workers, runs per worker stay fixed (Gustafson)
+BenchCase = namedtuple("BenchCase", ["backend", "engine", "workers", "servers", "runs", "scaling"])
+
+# Backends that run every day in this process whatever `workers` says
+SERIAL_BACKENDS = ("sequential", "vectorized")
+
+
+def process_cpu_seconds(pid):
+    """User + system CPU time of a live process from /proc (Linux); None where it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pids=()):
+    """User + system CPU time of this process, of every child it has waited for and of the live
+    children in `pids` (warm pool workers, which are never waited for); NaN if one cannot be read.
+    """
+    if resource is None:
+        times = os.times()
+        total = times.user + times.system + times.children_user + times.children_system
+    else:
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total = self_usage.ru_utime + self_usage.ru_stime + child_usage.ru_utime + child_usage.ru_stime
+    for pid in pids:
+        seconds = process_cpu_seconds(pid)
+        if seconds is None:
+            return float("nan")
+        total += seconds
+    return total
+
+
+def process_peak_rss_kb(pid):
+    """VmHWM (peak resident set size) in KiB of a live process from /proc (Linux); None where it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss(pids=()):
+    """Restarts the VmHWM of this process and of the live children in `pids` from their current RSS
+    (Linux 4.0+); where that is not possible the peaks keep covering the whole process lifetimes.
+    """
+    for pid in (os.getpid(), *pids):
+        try:
+            with open(f"/proc/{pid}/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            pass
+
+
+def peak_rss_kb(pids=()):
+    """Peak resident set size in KiB of the largest of this process and the live children in `pids`
+    (warm pool workers, which ru_maxrss never sees) since the last reset_peak_rss.
+
+    Falls back to the lifetime ru_maxrss of this process and its waited-for children without /proc.
+    """
+    peaks = [process_peak_rss_kb(pid) for pid in (os.getpid(), *pids)]
+    if None not in peaks:
+        return max(peaks)
+    if resource is None:
+        return None
+    scale = 1024 if platform.system() == "Darwin" else 1  # macOS reports bytes
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    ) // scale
+
+
+def bench_cases(backends, engines, workers, servers, runs, weak=False):
+    """Every combination, strong scaling always and weak scaling (runs x workers) on request.
+
+    SERIAL_BACKENDS only get a workers = 1 strong case: more workers would time the same run again.
+    """
+    cases = []
+    for backend in backends:
+        serial = backend in SERIAL_BACKENDS
+        for engine in engines:
+            for server_count in servers:
+                for run_count in runs:
+                    for worker_count in [1] if serial else workers:
+                        cases.append(BenchCase(backend, engine, worker_count, server_count, run_count, "strong"))
+                        if weak and not serial:
+                            cases.append(BenchCase(
+                                backend, engine, worker_count, server_count, run_count * worker_count, "weak"
+                            ))
+    return cases
+
+
+def measure(case, seed=2025, warmup=1, repetitions=3):
+    """Times one case on one backend: `warmup` untimed passes over its days, then `repetitions` timed ones.
+
+    Only runner.run is timed, so pool start-up, worker imports and JIT
+    compilation fall in the warm-up instead of biasing the fitted models.
+    The peak RSS covers the timed passes, of this process and of every worker.
+    """
+    params = Parameters(runs=case.runs, servers=case.servers, seed=seed, replicates=1, engine=case.engine)
+    capacities, streams, _ = capacity_plan(
+        params.sampling_mode, params.seed, params.runs, params.minimum_capacity, params.maximum_capacity, 1
+    )
+    capacities = np.round(capacities)
+    table = SharedResults.create(params.runs, params.workday_minutes // params.check_interval)
+    runner = BACKENDS[case.backend](params, case.workers)
+
+    def pids():
+        scheduler = getattr(runner, "scheduler", None)
+        return scheduler.worker_pids() if scheduler is not None else []
+
+    wall, cpu = [], []
+    try:
+        for _ in range(warmup):
+            runner.run(table, capacities, streams, 0, params.runs)
+        reset_peak_rss(pids())
+        for _ in range(repetitions):
+            cpu_start = cpu_seconds(pids())
+            start = time.perf_counter()
+            runner.run(table, capacities, streams, 0, params.runs)
+            wall.append(time.perf_counter() - start)
+            cpu.append(cpu_seconds(pids()) - cpu_start)
+        peak_rss = peak_rss_kb(pids())
+    except BaseException:
+        runner.close(error=True)
+        raise
+    else:
+        runner.close()
+    finally:
+        table.unlink()
+    median_wall = statistics.median(wall)
+    return {
+        **case._asdict(),
+        "wall": wall,
+        "cpu": cpu,
+        "median_wall": median_wall,
+        "days_per_second": case.runs / median_wall,
+        "peak_rss_kb": peak_rss,
+    }
+
+
+def fit_amdahl(workers, speedups):
+    """Least-squares parallel fraction P of S(N) = 1 / ((1 - P) + P / N), from 1 / S = 1 - P (1 - 1 / N)."""
+    x = 1 - 1 / np.asarray(workers, dtype=np.float64)
+    y = 1 - 1 / np.asarray(speedups, dtype=np.float64)
+    return float((x * y).sum() / (x * x).sum()) if (x * x).sum() else float("nan")
+
+
+def fit_gustafson(workers, scaled_speedups):
+    """Least-squares serial fraction alpha of the scaled speedup S(N) = N - alpha (N - 1)."""
+    x = np.asarray(workers, dtype=np.float64) - 1
+    y = np.asarray(workers, dtype=np.float64) - np.asarray(scaled_speedups, dtype=np.float64)
+    return float((x * y).sum() / (x * x).sum()) if (x * x).sum() else float("nan")
+
+
+def scaling_models(results):
+    """Amdahl / Gustafson fits per (backend, engine, servers, runs) group.
+
+    Speedups are taken against the group's own workers = 1 measurement, so a
+    group needs workers 1 and at least one other worker count to be fitted.
+    Weak scaling groups are keyed by runs per worker.
+    """
+    groups = defaultdict(dict)
+    for result in results:
+        runs_key = result["runs"] // result["workers"] if result["scaling"] == "weak" else result["runs"]
+        key = (result["backend"], result["engine"], result["servers"], runs_key, result["scaling"])
+        groups[key][result["workers"]] = result["median_wall"]
+
+    models = []
+    for (backend, engine, servers, runs, scaling), walls in sorted(groups.items()):
+        if 1 not in walls or len(walls) < 2:
+            continue
+        workers = sorted(walls)
+        if scaling == "strong":
+            speedups = [walls[1] / walls[n] for n in workers]
+            fit = {"amdahl_p": fit_amdahl(workers, speedups)}
+        else:
+            speedups = [n * walls[1] / walls[n] for n in workers]
+            fit = {"gustafson_alpha": fit_gustafson(workers, speedups)}
+        models.append({
+            "backend": backend, "engine": engine, "servers": servers, "runs": runs, "scaling": scaling,
+            "baseline_wall": walls[1], "workers": workers, "speedups": speedups, **fit,
+        })
+    return models
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_benchmarks(cases, seed=2025, warmup=1, repetitions=3, verbose=True):
+    """Measures every case and returns the JSON-ready report (environment, results, models)."""
+    results = []
+    for index, case in enumerate(cases):
+        result = measure(case, seed, warmup, repetitions)
+        results.append(result)
+        if verbose:
+            print(f"[Bench {index + 1}/{len(cases)}] {case.backend}/{case.engine} workers={case.workers} "
+                  f"servers={case.servers} runs={case.runs} ({case.scaling}): "
+                  f"{result['median_wall']:.2f}s, {result['days_per_second']:.1f} days/s")
+    return {"environment": environment(), "results": results, "models": scaling_models(results)}
+
+
+def case_key(result):
+    return tuple(result[field] for field in BenchCase._fields)
+
+
+def compare(report, baseline, tolerance=0.10):
+    """Median wall time ratio (current / baseline) for every case present in both reports.
+
+    Returns (case, ratio, verdict) with verdict "regression" above 1 + tolerance,
+    "improvement" below 1 - tolerance and "same" otherwise.
+    """
+    previous = {case_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in report["results"]:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        ratio = result["median_wall"] / old["median_wall"]
+        verdict = "regression" if ratio > 1 + tolerance else "improvement" if ratio < 1 - tolerance else "same"
+        rows.append((BenchCase(*case_key(result)), ratio, verdict))
+    return rows
+
+
+def notes_table(report):
+    """The notes.md "N processes took Xs" table, one block per SERVERS value (strong scaling runs)."""
+    lines = []
+    by_servers = defaultdict(list)
+    for result in report["results"]:
+        if result["scaling"] == "strong":
+            by_servers[result["servers"]].append(result)
+    for servers, results in sorted(by_servers.items()):
+        lines.append(f"With Server = {servers}")
+        for result in sorted(results, key=lambda r: (r["backend"], r["engine"], r["runs"], r["workers"])):
+            lines.append(f"{result['workers']} processes took {result['median_wall']:.2f}s "
+                         f"({result['backend']}/{result['engine']}, {result['runs']} runs)")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def save_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
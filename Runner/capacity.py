@@ -0,0 +1,65 @@
+# capacity.py
+import numpy as np
+from Engine.capacity_search import search_capacity
+from Engine.shared_results import SharedResults
+from Runner.metrics import PASSABLE_HAPPINESS, latency_stats
+from Runner.backends import BACKENDS
+from Runner.parameters import validate
+
+# What makes a simulated day a success
+#   pass      average happiness >= PASSABLE_HAPPINESS
+#   overload  at most max_overload_pct % of the latency samples at or above OVERLOAD_LATENCY
+CRITERIA = ("pass", "overload")
+
+
+def plan_capacity(params, backend="processes", workers=None, criterion="pass", max_overload_pct=10.0,
+                  target=0.9, confidence=0.95, resolution=5, batch_size=20, probe_days=100, verify_days=1000):
+    """Smallest server_max_capacity in [params.minimum_capacity, params.maximum_capacity]
+    where at least `target` of the days succeed, with `confidence` (Engine/capacity_search.py).
+
+    Day i runs on stream i at every capacity tried (common random numbers),
+    on every backend. The vectorized backend ignores params.engine.
+    The search assumes the success rate grows with capacity: true for "pass",
+    while overload (latency follows the players online) barely moves with
+    capacity in this model. Returns the CapacitySearch.
+    """
+    validate(params)
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion: {criterion}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    # One row per day index, overwritten at every capacity tried
+    table = SharedResults.create(verify_days, params.workday_minutes // params.check_interval)
+    streams = np.arange(verify_days)
+    runner = BACKENDS[backend](params, workers)
+
+    def evaluate(capacity, start, count):
+        capacities = np.full(verify_days, float(capacity))
+        runner.run(table, capacities, streams, start, count)
+        rows = slice(start, start + count)
+        if criterion == "pass":
+            return table.column("avg_happy")[rows] >= PASSABLE_HAPPINESS
+        _, overload_pct = latency_stats(table.tsl[rows])
+        return overload_pct <= max_overload_pct
+
+    try:
+        search = search_capacity(
+            evaluate,
+            params.minimum_capacity,
+            params.maximum_capacity,
+            target=target,
+            confidence=confidence,
+            resolution=resolution,
+            batch_size=batch_size,
+            probe_days=probe_days,
+            verify_days=verify_days,
+        )
+    except BaseException:
+        runner.close(error=True)
+        raise
+    else:
+        runner.close()
+    finally:
+        table.unlink()
+    return search
@@ -0,0 +1,83 @@
+# cluster.py
+from collections import namedtuple
+import numpy as np
+from Engine.cluster_engine import ROUTERS, simulate_cluster_day
+from Engine.scheduler import session_scheduler
+from Engine.seeding import run_rng, sample_capacities
+from Runner.metrics import OVERLOAD_LATENCY, PASSABLE_HAPPINESS
+
+# Per-day averages of one routing configuration over the compared days
+#   overload_pct   % of (server, sample) points with latency >= OVERLOAD_LATENCY
+#   full_pct       % of (server, sample) points with more players than the server's capacity
+#   imbalance      mean over samples of busiest server utilization / mean utilization
+#   pass_rate      share of days with avg_happiness >= PASSABLE_HAPPINESS
+PolicyResult = namedtuple("PolicyResult", [
+    "policy", "migrate", "days", "avg_happiness", "pass_rate", "overload_pct", "full_pct",
+    "imbalance", "dropouts", "migrations",
+])
+
+
+def cluster_capacities(seed, servers, minimum_capacity, maximum_capacity):
+    """Per-server capacities of a cluster, drawn from the sweep's capacity stream."""
+    return np.round(sample_capacities(seed, servers, minimum_capacity, maximum_capacity))
+
+
+def day_summary(day):
+    """(avg_happiness, overload %, full %, imbalance, disconnections, migrations) of one ClusterDay."""
+    capacities = day.capacities[:, None]
+    utilization = day.active_log / capacities
+    mean_utilization = utilization.mean(axis=0)
+    busy = mean_utilization > 0
+    imbalance = (utilization.max(axis=0)[busy] / mean_utilization[busy]).mean() if busy.any() else 1.0
+    return (
+        day.avg_happiness,
+        100 * (day.server_latency >= OVERLOAD_LATENCY).mean(),
+        100 * (day.active_log > capacities).mean(),
+        imbalance,
+        day.disconnections,
+        day.migrations,
+    )
+
+
+def cluster_task(task):
+    """Process pool task: summary of one (policy, migrate, day) simulation."""
+    workday_minutes, check_interval, capacities, policy, migrate, arrival_scale, seed, day = task
+    return day_summary(simulate_cluster_day(
+        workday_minutes, check_interval, capacities, policy, migrate, arrival_scale, rng=run_rng(seed, day)
+    ))
+
+
+def compare_policies(capacities, days=10, policies=None, migrate=(False, True), arrival_scale=None,
+                     workday_minutes=1440, check_interval=10, seed=2025, workers=None):
+    """Runs every routing policy, with and without migration, on the same `days` and returns PolicyResults.
+
+    Day i uses stream i for every configuration, and the arrivals are its
+    first draws, so all policies route exactly the same players.
+    """
+    policies = list(ROUTERS) if policies is None else policies
+    for policy in policies:
+        if policy not in ROUTERS:
+            raise ValueError(f"Unknown routing policy: {policy}")
+    configs = [(policy, flag) for policy in policies for flag in migrate]
+    tasks = [
+        (workday_minutes, check_interval, capacities, policy, flag, arrival_scale, seed, day)
+        for policy, flag in configs for day in range(days)
+    ]
+
+    scheduler = session_scheduler(workers)
+    try:
+        summaries = scheduler.run(cluster_task, tasks, label="Simulating clusters")
+    except BaseException:
+        scheduler.terminate()  # the session's pool stays warm only when the comparison finished
+        raise
+
+    results = []
+    for index, (policy, flag) in enumerate(configs):
+        happiness, overload, full, imbalance, dropouts, migrations = np.array(
+            summaries[index * days:(index + 1) * days], dtype=np.float64
+        ).T
+        results.append(PolicyResult(
+            policy, flag, days, happiness.mean(), (happiness >= PASSABLE_HAPPINESS).mean(), overload.mean(),
+            full.mean(), imbalance.mean(), dropouts.mean(), migrations.mean(),
+        ))
+    return results
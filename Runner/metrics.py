@@ -0,0 +1,140 @@
+# metrics.py
+"""Vectorized analytics of a sweep's columnar results (Engine/shared_results.py).
+
+Every function works on whole columns, (runs,) vectors and (runs, samples)
+matrices, so nothing loops over runs in Python and a million-day sweep is
+summarized in seconds. No plotting here: Runner/analysis.py draws from these.
+"""
+from collections import namedtuple
+import numpy as np
+from Objects.archetypes import PLAYER_TYPES
+
+PASSABLE_HAPPINESS = 75
+OVERLOAD_LATENCY = 100.0
+ROW_CHUNK = 1 << 16  # rows per pass over a (runs, samples) matrix, bounding the temporaries
+
+# The columns of a sweep, as views of its result table (no copies)
+#   capacity, avg_happiness, total_players, disconnections   (runs,)
+#   active_log, latency                                       (runs, samples) at every check_interval
+#   dropouts                                                  (runs, types) rage quits per archetype
+SweepColumns = namedtuple("SweepColumns", [
+    "capacity", "avg_happiness", "total_players", "disconnections", "active_log", "latency", "dropouts",
+])
+
+# Per capacity bin statistics of capacity_bins; empty bins are left out
+#   low, high      bin edges
+#   runs           days in the bin
+#   pass_rate      share of days with avg_happiness >= PASSABLE_HAPPINESS
+#   mean_latency   mean over days of the day's mean latency
+#   p95_latency    95th percentile over days of the day's mean latency
+#   overload_pct   mean over days of the % of samples at or above OVERLOAD_LATENCY
+CapacityBins = namedtuple("CapacityBins", [
+    "low", "high", "runs", "pass_rate", "mean_latency", "p95_latency", "overload_pct",
+])
+
+# Headline numbers of a sweep (see summarize)
+SweepSummary = namedtuple("SweepSummary", [
+    "runs", "pass_rate", "mean_latency", "overload_pct", "overload_capacity", "dropouts",
+])
+
+
+def sweep_columns(sweep):
+    """SweepColumns of the first sweep.runs rows of a Sweep's table."""
+    table, runs = sweep.table, sweep.runs
+    return SweepColumns(
+        table.column("smc")[:runs],
+        table.column("avg_happy")[:runs],
+        table.column("tpo")[:runs],
+        table.column("drop_out")[:runs],
+        table.log[:runs],
+        table.tsl[:runs],
+        table.scalars[:runs, -len(PLAYER_TYPES):],
+    )
+
+
+def pass_rate(avg_happiness):
+    """Share of days with avg_happiness >= PASSABLE_HAPPINESS (0 without days)."""
+    return float(np.count_nonzero(avg_happiness >= PASSABLE_HAPPINESS)) / max(len(avg_happiness), 1)
+
+
+def latency_stats(latency, threshold=OVERLOAD_LATENCY, chunk=ROW_CHUNK):
+    """(mean latency, overload %) of every day of a (runs, samples) latency matrix.
+
+    Works through `chunk` rows at a time, so memory-mapped recordings are read
+    once, in order, and the boolean temporaries stay small.
+    """
+    runs, samples = latency.shape
+    means = np.empty(runs)
+    overload_pct = np.empty(runs)
+    for start in range(0, runs, chunk):
+        block = np.asarray(latency[start:start + chunk])
+        means[start:start + len(block)] = block.mean(axis=1)
+        overload_pct[start:start + len(block)] = np.count_nonzero(block >= threshold, axis=1) * (100 / samples)
+    return means, overload_pct
+
+
+def grouped_percentile(groups, values, q, count):
+    """q-th percentile (linear interpolation, as np.percentile) of `values` within each of `count` groups.
+
+    One lexsort instead of a np.percentile call per group; empty groups are NaN.
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    sizes = np.bincount(groups, minlength=count)
+    starts = np.cumsum(sizes) - sizes
+    result = np.full(count, np.nan)
+    filled = sizes > 0
+    rank = q / 100 * (sizes[filled] - 1)
+    below = np.floor(rank).astype(np.int64)
+    above = np.ceil(rank).astype(np.int64)
+    low, high = ordered[starts[filled] + below], ordered[starts[filled] + above]
+    result[filled] = low + (high - low) * (rank - below)
+    return result
+
+
+def capacity_bins(capacity, avg_happiness, mean_latency, overload_pct, bins=40):
+    """CapacityBins of `bins` equal-width capacity bins, from the per-day columns."""
+    low, high = float(capacity.min()), float(capacity.max())
+    edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+    index = np.clip(np.searchsorted(edges, capacity, side="right") - 1, 0, bins - 1)
+    runs = np.bincount(index, minlength=bins)
+    filled = runs > 0
+
+    def mean(values):
+        return np.bincount(index, weights=values, minlength=bins)[filled] / runs[filled]
+
+    return CapacityBins(
+        edges[:-1][filled],
+        edges[1:][filled],
+        runs[filled],
+        mean(avg_happiness >= PASSABLE_HAPPINESS),
+        mean(mean_latency),
+        grouped_percentile(index, mean_latency, 95, bins)[filled],
+        mean(overload_pct),
+    )
+
+
+def overload_capacity(capacity, mean_latency):
+    """Capacity at the biggest jump in mean latency between neighbouring capacities (None below 2 days)."""
+    if len(capacity) < 2:
+        return None
+    order = np.argsort(capacity, kind="stable")
+    return float(capacity[order][np.argmax(np.diff(mean_latency[order]))])
+
+
+def dropouts_by_type(dropouts):
+    """{type: total rage quits} over every day of a (runs, types) dropouts matrix."""
+    return dict(zip(PLAYER_TYPES, dropouts.sum(axis=0).astype(np.int64).tolist()))
+
+
+def summarize(columns):
+    """SweepSummary of a SweepColumns."""
+    mean_latency, overload_pct = latency_stats(columns.latency)
+    return SweepSummary(
+        len(columns.capacity),
+        pass_rate(columns.avg_happiness),
+        float(mean_latency.mean()),
+        float(overload_pct.mean()),
+        overload_capacity(columns.capacity, mean_latency),
+        dropouts_by_type(columns.dropouts),
+    )
@@ -0,0 +1,38 @@
+# parameters.py
+from collections import namedtuple
+
+# Names only, so building the CLI parser or validating Parameters imports no engine, backend or plotting code
+#   ENGINE_NAMES       per-day engines of Runner/backends.py ENGINES
+#   ADMISSION_ENGINES  the ones that accept admission= (Engine/login_queue.py)
+#   BACKEND_NAMES      backends of Runner/backends.py BACKENDS
+#   PLOT_VIEWS         views of Runner/analysis.py plot_sweep
+ENGINE_NAMES = ("reference", "arrays", "events", "jit")
+ADMISSION_ENGINES = ("reference", "arrays", "jit")
+BACKEND_NAMES = ("sequential", "threads", "processes", "vectorized")
+PLOT_VIEWS = ("auto", "lines", "fan", "density")
+
+# Everything that defines a sweep; backends and analysis read only this
+#   runs              simulated days (the cap when stopping adaptively)
+#   workday_minutes   minutes per simulated day
+#   check_interval    minutes between active log / latency samples
+#   servers           spawn-rate multiplier
+#   minimum/maximum_capacity   server_max_capacity sampling range
+#   seed              root seed (Engine/seeding.py)
+#   sampling_mode     "uniform", "crn", "antithetic" or "lhs" (Engine/sampling.py)
+#   replicates        independent replicate groups used to measure variance reduction
+#   engine            one of ENGINE_NAMES
+Parameters = namedtuple("Parameters", [
+    "runs", "workday_minutes", "check_interval", "servers",
+    "minimum_capacity", "maximum_capacity", "seed",
+    "sampling_mode", "replicates", "engine",
+], defaults=[1000, 1440, 10, 1, 100, 300, 2025, "uniform", 10, "reference"])
+
+
+def validate(params):
+    if params.engine not in ENGINE_NAMES:
+        raise ValueError(f"Unknown engine: {params.engine}")
+    if params.runs < 1:
+        raise ValueError("runs must be at least 1")
+    if params.workday_minutes % params.check_interval:
+        raise ValueError("workday_minutes must be a multiple of check_interval")
+    return params
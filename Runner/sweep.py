@@ -0,0 +1,151 @@
+# sweep.py
+import time
+from collections import namedtuple
+import numpy as np
+from Engine.adaptive import run_adaptive, day_metrics
+from Engine.instrumentation import clear, merge_reports
+from Engine.sampling import capacity_plan
+from Engine.shared_results import SharedResults
+from Engine.trace_store import TraceStore, TraceWriter
+from Runner.backends import BACKENDS
+from Runner.parameters import Parameters, validate
+from Runner.warehouse import Warehouse, pending_batches
+
+# params:    the Parameters the sweep ran with
+# backend:   name of the backend that produced the rows
+# runs:      simulated days actually used (rows 0 .. runs - 1 of table)
+# elapsed:   wall time of the simulation phase in seconds
+# groups:    replicate group of every run
+# table:     SharedResults holding every per-run result (a TraceStore for recorded sweeps)
+# adaptive:  AdaptiveResult when the sweep stopped adaptively, else None
+# instrumentation: merged InstrumentationReport when the sweep was instrumented, else None
+Sweep = namedtuple("Sweep", ["params", "backend", "runs", "elapsed", "groups", "table", "adaptive", "instrumentation"])
+
+
+def run_sweep(params, backend="processes", workers=None, chunksize=None,
+              precision=None, time_budget=None, batch_size=100, instrumentation=None, record=None, warehouse=None, cache=None):
+    """Simulates params.runs days on the chosen backend and returns a Sweep.
+
+    With `precision` (metric -> target CI half-width, see Engine/adaptive.py)
+    days are submitted in batches of `batch_size` and the sweep stops as soon
+    as the targets or `time_budget` are met; params.runs is then the cap.
+    Adaptive sweeps reject the crn sampling mode.
+    `chunksize` is the pool chunk size for processes and the batch size in
+    days for vectorized. `instrumentation` (Engine/instrumentation.py) records
+    every day in the workers and is merged into one report at the end.
+
+    With `record` (a directory) the engines log every minute instead of every
+    check_interval, and the runs are written there as memory-mapped .npy files
+    (Engine/trace_store.py); the returned Sweep then reads them back from disk.
+    Recording does not change any random draw.
+
+    With `warehouse` (a SQLite path, Runner/warehouse.py) every batch of
+    `batch_size` days is committed there as soon as it finishes, and days the
+    warehouse already holds for this scenario are restored instead of simulated,
+    so an interrupted sweep resumes where it stopped.
+
+    `cache` (an Engine.day_cache.CacheConfig) memoizes the per-day backends'
+    days by content address, so days shared with an earlier sweep are not
+    simulated again.
+    """
+    validate(params)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    adaptive = precision is not None
+    if adaptive and warehouse is not None:
+        raise ValueError("An adaptive sweep cannot resume from a warehouse")
+    if adaptive and params.sampling_mode == "crn":
+        # One replicate group: every day would replay the same stream and the intervals would be meaningless
+        raise ValueError("An adaptive sweep needs independent days: use a sampling mode other than crn")
+
+    # Capacities are sampled once, here in the parent, and handed to every run
+    # (adaptive runs consume a prefix of the plan, so they use a single replicate group)
+    capacities, streams, groups = capacity_plan(
+        params.sampling_mode, params.seed, params.runs,
+        params.minimum_capacity, params.maximum_capacity,
+        1 if adaptive else params.replicates
+    )
+    capacities = np.round(capacities)
+    engine_params = params._replace(check_interval=1) if record is not None else params
+    table = SharedResults.create(params.runs, params.workday_minutes // engine_params.check_interval)
+
+    if instrumentation is not None:
+        clear(instrumentation.directory)
+        instrumentation = instrumentation._replace(workday_minutes=params.workday_minutes, token=time.time_ns())
+
+    start_time = time.perf_counter()
+    runner = BACKENDS[backend](engine_params, workers, chunksize, instrumentation, cache)
+    try:
+        if adaptive:
+            result = run_adaptive(
+                lambda start, count: runner.run(table, capacities, streams, start, count),
+                precision,
+                time_budget=time_budget,
+                batch_size=batch_size,
+                max_runs=params.runs,
+                metrics=lambda run_index: day_metrics(table.day(run_index))
+            )
+            runs = result.runs
+        else:
+            result = None
+            runs = params.runs
+            if warehouse is None:
+                runner.run(table, capacities, streams, 0, runs)
+            else:
+                run_resumable(runner, warehouse, engine_params, params, backend,
+                              table, capacities, streams, groups, batch_size)
+    except BaseException:
+        runner.close(error=True)
+        raise
+    else:
+        runner.close()
+    finally:
+        # Every writer is done; the name can go, the views stay valid in this process
+        table.unlink()
+    elapsed = time.perf_counter() - start_time
+
+    if not table.written[:runs].all():
+        raise RuntimeError("Some simulated days did not write their results")
+    report = merge_reports(instrumentation.directory) if instrumentation is not None else None
+    if record is not None:
+        table = record_sweep(record, table, params, backend, runs, elapsed, streams, groups)
+    return Sweep(params, backend, runs, elapsed, groups[:runs], table, result, report)
+
+
+def run_resumable(runner, path, engine_params, params, backend, table, capacities, streams, groups, batch_size):
+    """Restores the days the warehouse at `path` holds and simulates the rest, committing every batch."""
+    with Warehouse(path) as warehouse:
+        scenario = warehouse.scenario(engine_params, backend)
+        finished = warehouse.finished(scenario)
+        if len(finished):
+            warehouse.restore(scenario, table)
+            print(f"[Warehouse] Resuming scenario {scenario}: {len(finished)}/{params.runs} days already stored")
+        for start, count in pending_batches(params.runs, finished, batch_size):
+            run_indices = runner.run(table, capacities, streams, start, count)
+            warehouse.add_days(scenario, params, table, run_indices, streams, groups)
+
+
+def record_sweep(directory, table, params, backend, runs, elapsed, streams, groups, batch_rows=4096):
+    """Writes the first `runs` rows of a per-minute table to `directory` and returns the TraceStore."""
+    writer = TraceWriter(directory, runs, params.workday_minutes)
+    for start in range(0, runs, batch_rows):
+        rows = slice(start, min(start + batch_rows, runs))
+        writer.write_rows(
+            start,
+            active=table.log[rows],
+            latency=table.tsl[rows],
+            scalars=table.scalars[rows],
+            happiness=table.happiness[rows],
+            streams=streams[rows],
+            groups=groups[rows],
+        )
+    writer.close(params=params._asdict(), backend=backend, elapsed=elapsed, seed=params.seed)
+    return TraceStore(directory, params.check_interval)
+
+
+def load_sweep(directory):
+    """The Sweep recorded in `directory`, without re-simulating anything."""
+    store = TraceStore(directory)
+    manifest = store.manifest
+    return Sweep(Parameters(**manifest["params"]), manifest["backend"], store.runs, manifest["elapsed"],
+                 store.groups, store, None, None)
@@ -0,0 +1,173 @@
+# warehouse.py
+import json
+import sqlite3
+import time
+import numpy as np
+from Engine.shared_results import SCALAR_COLUMNS, scalar_columns
+from Objects.archetypes import PLAYER_TYPES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    params TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS days (
+    scenario INTEGER NOT NULL REFERENCES scenarios(id),
+    run_index INTEGER NOT NULL,
+    capacity REAL NOT NULL,
+    servers INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    stream INTEGER NOT NULL,
+    replicate INTEGER NOT NULL,
+    total_players_online INTEGER NOT NULL,
+    avg_happiness REAL NOT NULL,
+    disconnections INTEGER NOT NULL,
+    scalars BLOB NOT NULL,
+    active_log BLOB NOT NULL,
+    latency BLOB NOT NULL,
+    happiness BLOB NOT NULL,
+    PRIMARY KEY (scenario, run_index)
+);
+CREATE INDEX IF NOT EXISTS days_scenario_capacity_seed ON days (scenario, capacity, seed);
+CREATE INDEX IF NOT EXISTS days_servers_capacity ON days (servers, capacity);
+"""
+
+# Queryable per-day columns, besides the blobs that restore a SharedResults row exactly
+DAY_COLUMNS = (
+    "scenario", "run_index", "capacity", "servers", "seed", "stream", "replicate",
+    "total_players_online", "avg_happiness", "disconnections",
+)
+
+
+def scenario_key(params, backend):
+    """Everything a day's result depends on besides its run index.
+
+    Batching is not part of it: every backend gives a day the same result
+    whatever chunk or lockstep batch it ran in, so a sweep may resume with a
+    different batch size.
+    """
+    return json.dumps({
+        "params": params._asdict(),
+        "backend": backend,
+        "player_types": list(PLAYER_TYPES),
+    }, sort_keys=True)
+
+
+class Warehouse:
+    """Append-only SQLite store of simulated days, in WAL mode.
+
+    Every day is one row keyed by (scenario, run_index), with its capacity,
+    SERVERS and seed indexed for queries and its logs and happiness histogram
+    as blobs, so a resumed sweep restores finished rows instead of simulating
+    them again. Days are added in batches, one transaction per batch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scenario(self, params, backend):
+        """Id of the scenario, registered on first use."""
+        key = scenario_key(params, backend)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO scenarios (key, params, created) VALUES (?, ?, ?)",
+                (key, json.dumps(params._asdict()), time.strftime("%Y-%m-%dT%H:%M:%S")),
+            )
+        return self.connection.execute("SELECT id FROM scenarios WHERE key = ?", (key,)).fetchone()[0]
+
+    def finished(self, scenario):
+        """Sorted run indices already stored for `scenario`."""
+        rows = self.connection.execute("SELECT run_index FROM days WHERE scenario = ? ORDER BY run_index", (scenario,))
+        return np.array([row[0] for row in rows], dtype=np.int64)
+
+    def add_days(self, scenario, params, table, run_indices, streams, groups):
+        """Stores rows `run_indices` of a SharedResults table in one transaction."""
+        tpo, avg_happy, _, drop_out = (scalar_columns().index(name) for name in SCALAR_COLUMNS)
+        records = [
+            (
+                scenario, run_index, float(table.column("smc")[run_index]), params.servers, params.seed,
+                int(streams[run_index]), int(groups[run_index]),
+                int(table.scalars[run_index, tpo]), float(table.scalars[run_index, avg_happy]),
+                int(table.scalars[run_index, drop_out]),
+                table.scalars[run_index].tobytes(), table.log[run_index].tobytes(),
+                table.tsl[run_index].tobytes(), table.happiness[run_index].tobytes(),
+            )
+            for run_index in run_indices
+        ]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO days VALUES ({', '.join('?' * 14)})", records
+            )
+
+    def restore(self, scenario, table):
+        """Fills every stored row of `scenario` into a SharedResults table; returns how many."""
+        rows = self.connection.execute(
+            "SELECT run_index, scalars, active_log, latency, happiness FROM days WHERE scenario = ?", (scenario,)
+        )
+        count = 0
+        for run_index, scalars, active_log, latency, happiness in rows:
+            table.scalars[run_index] = np.frombuffer(scalars, dtype=table.scalars.dtype)
+            table.log[run_index] = np.frombuffer(active_log, dtype=table.log.dtype)
+            table.tsl[run_index] = np.frombuffer(latency, dtype=table.tsl.dtype)
+            table.happiness[run_index] = np.frombuffer(happiness, dtype=table.happiness.dtype).reshape(
+                table.happiness.shape[1:]
+            )
+            table.written[run_index] = True
+            count += 1
+        return count
+
+    def query(self, capacity=None, servers=None, scenario=None, seed=None):
+        """DAY_COLUMNS of every stored day matching the filters, as a dict of arrays.
+
+        `capacity` is an inclusive (low, high) range; the other filters are
+        exact, e.g. query(capacity=(180, 200), servers=3).
+        """
+        clauses, args = [], []
+        for column, value in (("scenario", scenario), ("servers", servers), ("seed", seed)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if capacity is not None:
+            clauses.append("capacity BETWEEN ? AND ?")
+            args.extend(capacity)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(f"SELECT {', '.join(DAY_COLUMNS)} FROM days{where}", args).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * len(DAY_COLUMNS)
+        return {name: np.array(values) for name, values in zip(DAY_COLUMNS, columns)}
+
+    def scenarios(self):
+        """(id, params dict, stored days) of every scenario."""
+        rows = self.connection.execute(
+            "SELECT s.id, s.params, COUNT(d.run_index) FROM scenarios s LEFT JOIN days d ON d.scenario = s.id GROUP BY s.id"
+        )
+        return [(scenario, json.loads(params), days) for scenario, params, days in rows]
+
+    def close(self):
+        self.connection.close()
+
+
+def pending_batches(runs, finished, batch_size):
+    """(start, count) ranges covering every run index not in `finished`, at most batch_size long."""
+    pending = np.setdiff1d(np.arange(runs), finished)
+    batches = []
+    if len(pending) == 0:
+        return batches
+    # Split at gaps, then into batch_size pieces
+    breaks = np.flatnonzero(np.diff(pending) != 1) + 1
+    for block in np.split(pending, breaks):
+        for start in range(0, len(block), batch_size):
+            piece = block[start:start + batch_size]
+            batches.append((int(piece[0]), len(piece)))
+    return batches